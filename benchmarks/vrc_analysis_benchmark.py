@@ -0,0 +1,334 @@
+# benchmarks/vrc_analysis_benchmark.py
+
+# VRC Analysis benchmark
+## Generates synthetic avatars at a few scales (meshes, polys, shape keys, bones, materials, textures), times every stage of the VRC analysis on them and writes the timings out as JSON.
+## Pass a previous results file with --baseline to get a comparison, stages that got slower than --threshold are flagged as regressions.
+### Run with a background Blender, or plain Python if the bpy module is installed:
+###     blender -b --factory-startup -P benchmarks/vrc_analysis_benchmark.py -- --output new.json --baseline old.json
+###     python benchmarks/vrc_analysis_benchmark.py --scales small medium
+### Generated textures are saved to a temporary folder (--texture-dir) and reused between runs, so only the first run pays for writing them.
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vv_tools import imageheaders
+from vv_tools.operators import materialsops
+from vv_tools.operators import vrcanalysisops
+
+
+SCALES = {
+    "small": {"meshes": 4, "polys": 5000, "shape_keys": 10, "bones": 60, "materials": 4, "textures": 4, "texture_size": 1024, "duplicates": 0},
+    "medium": {"meshes": 16, "polys": 20000, "shape_keys": 50, "bones": 150, "materials": 16, "textures": 12, "texture_size": 2048, "duplicates": 10},
+    "large": {"meshes": 40, "polys": 50000, "shape_keys": 100, "bones": 300, "materials": 32, "textures": 24, "texture_size": 2048, "duplicates": 30},
+}
+
+
+def _script_args():
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+    if bpy.app.background and not sys.argv[0].endswith(".py"):
+        return []
+    return sys.argv[1:]
+
+
+# Avatar generation
+
+def reset_scene():
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    vrcanalysisops.invalidate_analysis_cache()
+    materialsops.clear_material_images_cache()
+    imageheaders.clear_header_cache()
+
+
+def make_grid_mesh(name, polys):
+    side = max(int(math.sqrt(polys)), 1)
+    xs, ys = np.meshgrid(np.linspace(-1.0, 1.0, side + 1), np.linspace(-1.0, 1.0, side + 1))
+    verts = np.column_stack((xs.ravel(), ys.ravel(), np.zeros(xs.size)))
+    rows, cols = np.meshgrid(np.arange(side), np.arange(side), indexing="ij")
+    corner = (rows * (side + 1) + cols).ravel()
+    faces = np.column_stack((corner, corner + 1, corner + side + 2, corner + side + 1))
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(verts.tolist(), [], faces.tolist())
+    mesh.update()
+    return mesh
+
+
+def make_texture(texture_dir, index, size, alpha):
+    filepath = os.path.join(texture_dir, f"vv_bench_{size}_{index}_{'rgba' if alpha else 'rgb'}.png")
+    if not os.path.exists(filepath):
+        img = bpy.data.images.new(f"gen_{index}", size, size, alpha=alpha)
+        img.generated_type = 'UV_GRID'
+        img.filepath_raw = filepath
+        img.file_format = 'PNG'
+        img.save()
+        bpy.data.images.remove(img)
+    return bpy.data.images.load(filepath, check_existing=True)
+
+
+def make_material(name, images):
+    mat = bpy.data.materials.new(name)
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    for i, img in enumerate(images):
+        node = nodes.new("ShaderNodeTexImage")
+        node.image = img
+        node.location = (-300, -300 * i)
+    return mat
+
+
+def make_armature(name, bone_count):
+    arm_data = bpy.data.armatures.new(name)
+    arm_obj = bpy.data.objects.new(name, arm_data)
+    bpy.context.scene.collection.objects.link(arm_obj)
+    bpy.context.view_layer.objects.active = arm_obj
+    bpy.ops.object.mode_set(mode='EDIT')
+    parent = None
+    for i in range(bone_count):
+        bone = arm_data.edit_bones.new(f"Bone_{i:03d}")
+        bone.head = (0.0, 0.0, i * 0.1)
+        bone.tail = (0.0, 0.0, i * 0.1 + 0.1)
+        bone.parent = parent
+        # Every fifth bone is a control bone, so effective bone counting has something to strip
+        bone.use_deform = i % 5 != 4
+        parent = bone
+    bpy.ops.object.mode_set(mode='OBJECT')
+    return arm_obj
+
+
+def generate_avatar(scale, texture_dir):
+    reset_scene()
+    rng = np.random.default_rng(0)
+    scene_collection = bpy.context.scene.collection
+
+    armature = make_armature("Armature", scale["bones"])
+    bone_names = [bone.name for bone in armature.data.bones]
+
+    images = [make_texture(texture_dir, i, scale["texture_size"], alpha=i % 3 == 0) for i in range(scale["textures"])]
+    materials = [make_material(f"Material_{i}", [images[i % len(images)], images[(i * 7 + 1) % len(images)]]) for i in range(scale["materials"])]
+
+    objects = [armature]
+    for i in range(scale["meshes"]):
+        mesh = make_grid_mesh(f"Mesh_{i}", scale["polys"])
+        obj = bpy.data.objects.new(f"Mesh_{i}", mesh)
+        scene_collection.objects.link(obj)
+        objects.append(obj)
+
+        for slot in range(max(scale["materials"] // scale["meshes"], 1)):
+            mesh.materials.append(materials[(i + slot) % len(materials)])
+
+        # Weight blocks of vertices to half of the bones
+        vertex_count = len(mesh.vertices)
+        weighted_bones = bone_names[::2]
+        block = max(vertex_count // len(weighted_bones), 1)
+        for b, bone_name in enumerate(weighted_bones):
+            group = obj.vertex_groups.new(name=bone_name)
+            group.add(list(range(b * block, min((b + 1) * block, vertex_count))), 1.0, 'REPLACE')
+        modifier = obj.modifiers.new("Armature", 'ARMATURE')
+        modifier.object = armature
+
+        # Shape keys each move a random 10% of the vertices
+        if scale["shape_keys"]:
+            basis = obj.shape_key_add(name="Basis")
+            basis_co = np.empty(vertex_count * 3, dtype=np.float32)
+            basis.data.foreach_get("co", basis_co)
+            for k in range(scale["shape_keys"]):
+                key = obj.shape_key_add(name=f"Key_{k}", from_mix=False)
+                co = basis_co.reshape(-1, 3).copy()
+                moved = rng.choice(vertex_count, size=max(vertex_count // 10, 1), replace=False)
+                co[moved, 2] += 0.01
+                key.data.foreach_set("co", co.ravel())
+
+    # Linked duplicates of a small accessory, the kind of thing deduplication is meant for
+    if scale["duplicates"]:
+        rivet_mesh = make_grid_mesh("Rivet", 200)
+        rivet_mesh.materials.append(materials[0])
+        for i in range(scale["duplicates"]):
+            obj = bpy.data.objects.new(f"Rivet_{i}", rivet_mesh)
+            scene_collection.objects.link(obj)
+            objects.append(obj)
+
+    return objects, images
+
+
+# Stages
+
+def _timed(function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark_scale(scale, texture_dir, repeat):
+    objects, images = generate_avatar(scale, texture_dir)
+    meshes = [obj for obj in objects if obj.type == 'MESH']
+    settings = vrcanalysisops.DEFAULT_TEXTURE_SETTINGS
+
+    def depsgraph():
+        for obj in meshes:
+            obj.update_tag()
+        bpy.context.evaluated_depsgraph_get().update()
+
+    def triangles():
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        for obj in meshes:
+            eval_obj = obj.evaluated_get(depsgraph)
+            vrcanalysisops.count_triangles(eval_obj.to_mesh())
+            eval_obj.to_mesh_clear()
+
+    def vertex_buffers():
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        for obj in meshes:
+            eval_obj = obj.evaluated_get(depsgraph)
+            vrcanalysisops.estimate_vertex_buffer(eval_obj.to_mesh(), True)
+            eval_obj.to_mesh_clear()
+
+    def shape_keys():
+        for obj in meshes:
+            vrcanalysisops.estimate_shape_key_memory(obj.data)
+
+    def weights():
+        for obj in meshes:
+            vrcanalysisops.get_weighted_group_indices(obj.data, len(obj.vertex_groups))
+
+    def material_images():
+        materialsops.clear_material_images_cache()
+        materialsops.get_objects_images(meshes)
+
+    def texture_memory():
+        vrcanalysisops.invalidate_analysis_cache()
+        imageheaders.clear_header_cache()
+        for img in images:
+            vrcanalysisops.estimate_texture_memory(img, settings)
+
+    def analysis_cold():
+        vrcanalysisops.invalidate_analysis_cache()
+        materialsops.clear_material_images_cache()
+        vrcanalysisops.analyze_objects(objects, texture_settings=settings)
+
+    def analysis_warm():
+        vrcanalysisops.analyze_objects(objects, texture_settings=settings)
+
+    results = vrcanalysisops.analyze_objects(objects, texture_settings=settings)
+    profiles = vrcanalysisops.get_rank_profiles()
+
+    def ranking():
+        for profile_id in profiles:
+            vrcanalysisops.performance_rank(results, profile_id, profiles)
+            vrcanalysisops.performance_warning(results, profile_id, profiles)
+
+    stages = {
+        "depsgraph": depsgraph,
+        "triangles": triangles,
+        "vertex_buffers": vertex_buffers,
+        "shape_keys": shape_keys,
+        "weights": weights,
+        "material_images": material_images,
+        "texture_memory": texture_memory,
+        "analysis_cold": analysis_cold,
+        "analysis_warm": analysis_warm,
+        "ranking": ranking,
+    }
+    timings = {name: _timed(function, repeat) for name, function in stages.items()}
+
+    statistics = {key: value for key, value in results.items() if key != "objects"}
+    return {"config": scale, "statistics": statistics, "stages": timings}
+
+
+# Baseline comparison
+
+def compare(results, baseline, threshold, min_delta):
+    regressions = []
+    for scale_name, scale in results["scales"].items():
+        base_scale = baseline.get("scales", {}).get(scale_name)
+        if base_scale is None:
+            continue
+        comparison = {}
+        for stage, seconds in scale["stages"].items():
+            base_seconds = base_scale["stages"].get(stage)
+            if not base_seconds:
+                continue
+            ratio = seconds / base_seconds
+            regressed = ratio > 1.0 + threshold and seconds - base_seconds > min_delta
+            comparison[stage] = {"baseline": base_seconds, "ratio": ratio, "regression": regressed}
+            if regressed:
+                regressions.append(f"{scale_name}/{stage}")
+        scale["comparison"] = comparison
+    return regressions
+
+
+def print_report(results):
+    for scale_name, scale in results["scales"].items():
+        print(f"\n{scale_name}: {scale['config']}")
+        for stage, seconds in scale["stages"].items():
+            line = f"  {stage:<16} {seconds * 1000:10.2f} ms"
+            comparison = scale.get("comparison", {}).get(stage)
+            if comparison:
+                line += f"  x{comparison['ratio']:.2f} vs baseline"
+                if comparison["regression"]:
+                    line += "  <- REGRESSION"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the VV Tools VRC analysis")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=list(SCALES), help="Avatar scales to run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage, the fastest one is kept")
+    parser.add_argument("-o", "--output", default="vrc_benchmark.json", help="Where to write the results")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative slowdown counted as a regression (0.1 = 10%%)")
+    parser.add_argument("--min-delta", type=float, default=0.001, help="Ignore slowdowns smaller than this many seconds")
+    parser.add_argument("--texture-dir", default=os.path.join(tempfile.gettempdir(), "vv_tools_benchmark"), help="Folder for generated textures")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with an error code if anything regressed")
+    args = parser.parse_args(_script_args())
+
+    os.makedirs(args.texture_dir, exist_ok=True)
+
+    results = {
+        "version": 1,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "blender": bpy.app.version_string,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "scales": {},
+    }
+    for scale_name in args.scales:
+        print(f"Benchmarking {scale_name}...")
+        results["scales"][scale_name] = benchmark_scale(SCALES[scale_name], args.texture_dir, args.repeat)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+        results["regressions"] = regressions
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print_report(results)
+    print(f"\nResults written to {args.output}")
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# atlaspacker.py
+
+# Texture atlas packing
+## Packs rectangles (texture sizes, padding included) into as few fixed size pages as possible, for the texture atlas builder in materialsops.py.
+## Skyline bottom-left packer - every page keeps the outline of its filled area as a list of horizontal segments, each rectangle goes wherever it ends up lowest.
+### Pure Python, no bpy in here.
+
+from collections import namedtuple
+
+Placement = namedtuple("Placement", ["key", "page", "x", "y", "width", "height"])
+
+
+class SkylinePage:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        # Segments are [x, y, width], left to right, covering the whole page width
+        self.skyline = [[0, 0, width]]
+        self.used_width = 0
+        self.used_height = 0
+
+    def _fit(self, index, width, height):
+        x = self.skyline[index][0]
+        if x + width > self.width:
+            return None
+        y = 0
+        remaining = width
+        while remaining > 0:
+            _, segment_y, segment_width = self.skyline[index]
+            y = max(y, segment_y)
+            if y + height > self.height:
+                return None
+            remaining -= segment_width
+            index += 1
+        return y
+
+    def insert(self, width, height):
+        best = None
+        for index, (x, _, segment_width) in enumerate(self.skyline):
+            y = self._fit(index, width, height)
+            if y is None:
+                continue
+            # Lowest top edge first, then the narrowest segment so wide gaps stay open for wide rectangles
+            score = (y + height, segment_width)
+            if best is None or score < best[0]:
+                best = (score, index, x, y)
+        if best is None:
+            return None
+
+        _, index, x, y = best
+        self._add_segment(index, x, y + height, width)
+        self.used_width = max(self.used_width, x + width)
+        self.used_height = max(self.used_height, y + height)
+        return x, y
+
+    def _add_segment(self, index, x, y, width):
+        self.skyline.insert(index, [x, y, width])
+        # Trim / drop the segments now covered by the new one
+        end = x + width
+        i = index + 1
+        while i < len(self.skyline):
+            segment = self.skyline[i]
+            if segment[0] >= end:
+                break
+            segment_end = segment[0] + segment[2]
+            if segment_end <= end:
+                del self.skyline[i]
+                continue
+            segment[2] = segment_end - end
+            segment[0] = end
+            break
+        # Merge neighbours at the same height
+        i = 0
+        while i < len(self.skyline) - 1:
+            if self.skyline[i][1] == self.skyline[i + 1][1]:
+                self.skyline[i][2] += self.skyline.pop(i + 1)[2]
+            else:
+                i += 1
+
+
+def _power_of_two(size):
+    power = 1
+    while power < size:
+        power *= 2
+    return power
+
+
+def pack_rectangles(rectangles, page_size):
+    # rectangles: {key: (width, height)}. Returns ([Placement...], [(page width, page height)...]).
+    # Rectangles are placed biggest first, new pages are only opened once nothing fits on the existing ones.
+    # Pages are trimmed down to the smallest power of two sizes that hold everything placed on them.
+    pages = []
+    placements = []
+    for key, (width, height) in sorted(rectangles.items(), key=lambda item: (item[1][1], item[1][0]), reverse=True):
+        if width > page_size or height > page_size:
+            raise ValueError(f"{key} ({width}x{height}) doesn't fit in a {page_size}x{page_size} atlas")
+        for page_index, page in enumerate(pages):
+            position = page.insert(width, height)
+            if position is not None:
+                break
+        else:
+            page_index = len(pages)
+            page = SkylinePage(page_size, page_size)
+            pages.append(page)
+            position = page.insert(width, height)
+        placements.append(Placement(key, page_index, position[0], position[1], width, height))
+
+    page_sizes = [(min(_power_of_two(page.used_width), page_size), min(_power_of_two(page.used_height), page_size)) for page in pages]
+    return placements, page_sizes
@@ -0,0 +1,245 @@
+# imageheaders.py
+
+# Image header reader
+## Reads width, height, channel count and format straight out of image file headers on disk, without decoding any pixels.
+### Used by the VRC analysis for texture memory estimates - asking Blender for img.size forces it to load the whole pixel buffer, which is painfully slow with lots of 4K/8K textures.
+### Pure Python, no bpy in here, so it can be used from background scripts too.
+
+import os
+import struct
+from collections import namedtuple
+
+ImageHeader = namedtuple("ImageHeader", ["width", "height", "channels", "format"])
+
+# Results are cached on (path, mtime, size) so repeated analysis runs don't touch the disk again unless the file changed.
+_header_cache = {}
+
+
+def _read_png(f):
+    if f.read(8) != b"\x89PNG\r\n\x1a\n":
+        return None
+    length, chunk_type = struct.unpack(">I4s", f.read(8))
+    if chunk_type != b"IHDR" or length < 13:
+        return None
+    width, height, bit_depth, color_type = struct.unpack(">IIBB", f.read(10))
+    channels = {0: 1, 2: 3, 3: 3, 4: 2, 6: 4}.get(color_type)
+    if channels is None:
+        return None
+
+    # Greyscale / RGB / paletted images can still carry transparency in a tRNS chunk, which comes before the image data
+    if color_type in (0, 2, 3):
+        f.seek(8 + 8 + length + 4)
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                break
+            length, chunk_type = struct.unpack(">I4s", chunk)
+            if chunk_type == b"tRNS":
+                channels += 1
+                break
+            if chunk_type in (b"IDAT", b"IEND"):
+                break
+            f.seek(length + 4, os.SEEK_CUR)
+
+    return ImageHeader(width, height, channels, "PNG")
+
+
+# SOF markers carry the frame size. C4 (DHT), C8 (JPG) and CC (DAC) share the range but aren't frames.
+_JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+def _read_jpeg(f):
+    if f.read(2) != b"\xff\xd8":
+        return None
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        if byte != b"\xff":
+            continue
+        marker = f.read(1)
+        while marker == b"\xff":
+            marker = f.read(1)
+        if not marker:
+            return None
+        marker = marker[0]
+        # Standalone markers have no length field
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+            continue
+        segment = f.read(2)
+        if len(segment) < 2:
+            return None
+        length = struct.unpack(">H", segment)[0]
+        if marker in _JPEG_SOF_MARKERS:
+            data = f.read(6)
+            if len(data) < 6:
+                return None
+            precision, height, width, components = struct.unpack(">BHHB", data)
+            return ImageHeader(width, height, 1 if components == 1 else 3, "JPEG") # CMYK JPEGs still end up as RGB
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def _read_tga(f):
+    data = f.read(18)
+    if len(data) < 18:
+        return None
+    color_map_type, image_type = data[1], data[2]
+    if color_map_type not in (0, 1) or image_type not in (1, 2, 3, 9, 10, 11):
+        return None
+    width, height, pixel_depth, descriptor = struct.unpack("<HHBB", data[12:18])
+    alpha_bits = descriptor & 0x0F
+    if image_type in (3, 11):
+        channels = 2 if alpha_bits else 1
+    elif image_type in (1, 9):
+        channels = 4 if struct.unpack("<B", data[7:8])[0] == 32 else 3
+    else:
+        channels = 4 if pixel_depth == 32 or alpha_bits else 3
+    return ImageHeader(width, height, channels, "TGA")
+
+
+def _read_tiff(f):
+    byte_order = f.read(2)
+    if byte_order == b"II":
+        endian = "<"
+    elif byte_order == b"MM":
+        endian = ">"
+    else:
+        return None
+    magic, ifd_offset = struct.unpack(endian + "HI", f.read(6))
+    if magic != 42: # BigTIFF (43) isn't handled, falls back to Blender
+        return None
+
+    f.seek(ifd_offset)
+    entry_count = struct.unpack(endian + "H", f.read(2))[0]
+    tags = {}
+    for _ in range(entry_count):
+        entry = f.read(12)
+        if len(entry) < 12:
+            break
+        tag, field_type, count = struct.unpack(endian + "HHI", entry[:8])
+        if field_type == 3: # SHORT
+            value = struct.unpack(endian + "H", entry[8:10])[0]
+        elif field_type == 4: # LONG
+            value = struct.unpack(endian + "I", entry[8:12])[0]
+        else:
+            continue
+        tags[tag] = value
+
+    if 256 not in tags or 257 not in tags:
+        return None
+    # 277 = SamplesPerPixel, includes any alpha / extra samples
+    return ImageHeader(tags[256], tags[257], tags.get(277, 1), "TIFF")
+
+
+def _read_exr(f):
+    if f.read(4) != b"\x76\x2f\x31\x01":
+        return None
+    f.read(4) # version / flags
+
+    def read_string():
+        chars = bytearray()
+        while True:
+            char = f.read(1)
+            if not char or char == b"\x00":
+                return bytes(chars)
+            chars += char
+
+    width = height = None
+    channels = 0
+    while True:
+        name = read_string()
+        if not name:
+            break
+        attribute_type = read_string()
+        size_data = f.read(4)
+        if len(size_data) < 4:
+            return None
+        size = struct.unpack("<i", size_data)[0]
+        value = f.read(size)
+        if name == b"dataWindow" and attribute_type == b"box2i":
+            x_min, y_min, x_max, y_max = struct.unpack("<iiii", value[:16])
+            width, height = x_max - x_min + 1, y_max - y_min + 1
+        elif name == b"channels" and attribute_type == b"chlist":
+            # Each channel is name\0 followed by 16 bytes of pixel type / sampling info, list ends with an empty name
+            offset = 0
+            while offset < len(value) and value[offset] != 0:
+                offset = value.index(b"\x00", offset) + 1 + 16
+                channels += 1
+
+    if width is None:
+        return None
+    return ImageHeader(width, height, channels or 4, "EXR")
+
+
+_DXGI_FORMATS = {
+    71: "BC1", 72: "BC1",
+    74: "BC2", 75: "BC2",
+    77: "BC3", 78: "BC3",
+    80: "BC4", 81: "BC4",
+    83: "BC5", 84: "BC5",
+    95: "BC6H", 96: "BC6H",
+    98: "BC7", 99: "BC7",
+}
+
+def _read_dds(f):
+    if f.read(4) != b"DDS ":
+        return None
+    header = f.read(124)
+    if len(header) < 124:
+        return None
+    height, width = struct.unpack("<II", header[8:16])
+    pf_flags, four_cc = struct.unpack("<I4s", header[76:84])
+
+    if pf_flags & 0x4: # DDPF_FOURCC
+        image_format = four_cc.decode("ascii", "replace").strip("\x00 ")
+        if image_format == "DX10":
+            dx10_header = f.read(20)
+            if len(dx10_header) >= 4:
+                image_format = _DXGI_FORMATS.get(struct.unpack("<I", dx10_header[:4])[0], "DX10")
+        channels = 3 if image_format in ("DXT1", "BC1", "ATI1", "BC4", "ATI2", "BC5", "BC6H") else 4
+    else:
+        image_format = "RGBA" if pf_flags & 0x1 else "RGB" # DDPF_ALPHAPIXELS
+        channels = 4 if pf_flags & 0x1 else 3
+
+    return ImageHeader(width, height, channels, "DDS " + image_format)
+
+
+_READERS_BY_EXTENSION = {
+    ".png": _read_png,
+    ".jpg": _read_jpeg,
+    ".jpeg": _read_jpeg,
+    ".tga": _read_tga,
+    ".tif": _read_tiff,
+    ".tiff": _read_tiff,
+    ".exr": _read_exr,
+    ".dds": _read_dds,
+}
+
+def read_image_header(filepath):
+    # Returns an ImageHeader, or None if the file is missing / unsupported / unreadable.
+    reader = _READERS_BY_EXTENSION.get(os.path.splitext(filepath)[1].lower())
+    if reader is None:
+        return None
+
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+
+    cached = _header_cache.get(filepath)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    try:
+        with open(filepath, "rb") as f:
+            header = reader(f)
+    except (OSError, struct.error, ValueError, IndexError):
+        header = None
+
+    if header is not None and (header.width <= 0 or header.height <= 0):
+        header = None
+
+    _header_cache[filepath] = (stat.st_mtime_ns, stat.st_size, header)
+    return header
+
+def clear_header_cache():
+    _header_cache.clear()
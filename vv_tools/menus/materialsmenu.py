@@ -9,6 +9,8 @@ class TOPBAR_MT_VV_Materials(bpy.types.Menu):
         layout = self.layout
         layout.operator("vv_tools.reload_textures_of_selected")
         layout.operator("vv_tools.remove_unused_materials")
+        layout.operator("vv_tools.merge_duplicate_materials")
+        layout.operator("vv_tools.build_texture_atlas")
         
 classes = [
     TOPBAR_MT_VV_Materials,
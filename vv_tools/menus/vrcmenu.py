@@ -8,6 +8,8 @@ class TOPBAR_MT_VV_VRC(bpy.types.Menu):
     def draw(self, context):
         layout = self.layout
         layout.operator("vv_tools.vrc_analyse")
+        layout.operator("vv_tools.vrc_analyse_modal")
+        layout.operator("vv_tools.vrc_export_report")
 
 classes = [
     TOPBAR_MT_VV_VRC,
@@ -1,7 +1,273 @@
 #operators/materialsops.py
 
 import bpy
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from bpy.app.handlers import persistent
 from bpy.types import Operator
+from ..atlaspacker import pack_rectangles
+from ..imageheaders import read_image_header
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Material image lookup
+## Shared by the VRC analysis and Reload Textures - returns every image used by a material, including ones tucked away inside (nested) node groups.
+### Each node tree is only walked once: per tree we keep the images it uses directly plus the groups it references, and the resolved set per material on top of that.
+### So 40 objects sharing 5 materials is 5 walks, not 40+. Entries are dropped when the depsgraph reports the material / node group as updated.
+
+_node_tree_cache = {}
+_material_images_cache = {}
+
+def _scan_node_tree(node_tree):
+    key = node_tree.as_pointer()
+    cached = _node_tree_cache.get(key)
+    if cached is None:
+        images = set()
+        groups = []
+        for node in node_tree.nodes:
+            if node.type in {'TEX_IMAGE', 'TEX_ENVIRONMENT'}:
+                if node.image:
+                    images.add(node.image)
+            elif node.type == 'GROUP' and node.node_tree:
+                groups.append(node.node_tree)
+        cached = (frozenset(images), tuple(groups))
+        _node_tree_cache[key] = cached
+    return cached
+
+def get_node_tree_images(node_tree, visited=None):
+    if visited is None:
+        visited = set()
+    key = node_tree.as_pointer()
+    if key in visited:
+        return set()
+    visited.add(key)
+
+    images, groups = _scan_node_tree(node_tree)
+    images = set(images)
+    for group in groups:
+        images |= get_node_tree_images(group, visited)
+    return images
+
+def get_material_images(material):
+    if material is None or not material.use_nodes or material.node_tree is None:
+        return frozenset()
+
+    key = material.as_pointer()
+    images = _material_images_cache.get(key)
+    if images is None:
+        images = frozenset(get_node_tree_images(material.node_tree))
+        _material_images_cache[key] = images
+    return images
+
+def get_objects_images(objects):
+    images = set()
+    for obj in objects:
+        for slot in obj.material_slots:
+            images |= get_material_images(slot.material)
+    return images
+
+def clear_material_images_cache():
+    _node_tree_cache.clear()
+    _material_images_cache.clear()
+    _node_tree_hash_cache.clear()
+    _material_hash_cache.clear()
+
+# Material content hashes
+## Two materials hash the same if their settings, nodes (type, settings, mute state, unlinked socket values, images), links (mute state included) and node groups are the same - names aside. Body, Body.001 and Body.002 straight out of an import end up in one group.
+### Hashes are memoized per material and per node tree (groups are hashed once no matter how many materials use them), and dropped by the same depsgraph handler as the image lookup.
+### With images=False, images only count by their colour space - materials that are the same shader with different textures hash the same (used by the atlas builder).
+
+_node_tree_hash_cache = {}
+_material_hash_cache = {}
+
+# ID level properties (name, users, fake user...) don't change what a material looks like
+_HASH_IGNORED_PROPERTIES = {prop.identifier for prop in bpy.types.ID.bl_rna.properties} | {
+    "rna_type", "bl_rna", "id_data", "name", "select", "preview", "preview_render_type", "paint_active_slot",
+    "texture_paint_images", "texture_paint_slots", "animation_data",
+}
+# Node UI state - only skipped on the nodes themselves, nested settings have their own 'location' / 'color' (curve points, ramp stops)
+_HASH_IGNORED_NODE_PROPERTIES = {
+    "label", "location", "width", "width_hidden", "height", "dimensions", "show_options", "show_preview", "show_texture",
+    "hide", "use_custom_color", "color", "parent", "bl_idname", "bl_label", "bl_description", "bl_icon",
+    "bl_static_type", "bl_width_default", "bl_width_min", "bl_width_max", "bl_height_default", "bl_height_min", "bl_height_max",
+}
+# Color Ramp stops, RGB Curves points etc. are a few structs deep (CurveMapping -> CurveMap -> CurveMapPoint)
+_HASH_MAX_DEPTH = 4
+
+def _property_signature(struct, depth=0, images=True):
+    values = []
+    for prop in struct.bl_rna.properties:
+        identifier = prop.identifier
+        if identifier in _HASH_IGNORED_PROPERTIES:
+            continue
+        if depth == 0 and isinstance(struct, bpy.types.Node) and identifier in _HASH_IGNORED_NODE_PROPERTIES:
+            continue
+        value = getattr(struct, identifier, None)
+        if prop.type == 'COLLECTION':
+            # Node sockets and links are hashed separately by node_tree_hash, only nested settings (ramp stops, curve points...) go in here
+            if depth == 0 or depth >= _HASH_MAX_DEPTH:
+                continue
+            value = tuple(_property_signature(item, depth + 1, images) for item in value)
+        elif prop.type == 'POINTER':
+            if isinstance(value, bpy.types.NodeTree):
+                value = node_tree_hash(value, images)
+            elif isinstance(value, bpy.types.Image) and not images:
+                value = ('IMAGE', value.colorspace_settings.name)
+            elif isinstance(value, bpy.types.ID):
+                value = value.name_full
+            elif value is not None:
+                if depth >= _HASH_MAX_DEPTH:
+                    continue
+                value = _property_signature(value, depth + 1, images)
+        elif getattr(prop, "is_array", False):
+            value = tuple(value)
+        elif isinstance(value, set): # Enum flags
+            value = tuple(sorted(value))
+        values.append((identifier, value))
+    return values
+
+# Unlinked socket values - inputs, and outputs too since Value / RGB / Normal nodes keep their value on the output socket
+def _socket_values(sockets):
+    values = []
+    for socket in sockets:
+        if socket.is_linked or not hasattr(socket, "default_value"):
+            continue
+        value = socket.default_value
+        if not isinstance(value, (bool, int, float, str)):
+            value = tuple(value)
+        values.append((socket.identifier, value))
+    return values
+
+def node_tree_hash(node_tree, images=True):
+    key = (node_tree.as_pointer(), images)
+    cached = _node_tree_hash_cache.get(key)
+    if cached is None:
+        # Stops recursion if a group somehow ends up inside itself
+        _node_tree_hash_cache[key] = "recursive"
+        nodes = sorted(node_tree.nodes, key=lambda node: node.name)
+        node_indices = {node.name: index for index, node in enumerate(nodes)}
+        signature = []
+        for node in nodes:
+            signature.append((node.bl_idname, _property_signature(node, images=images), _socket_values(node.inputs), _socket_values(node.outputs)))
+        links = sorted(
+            (node_indices[link.from_node.name], link.from_socket.identifier, node_indices[link.to_node.name], link.to_socket.identifier, link.is_muted)
+            for link in node_tree.links if link.is_valid
+        )
+        signature.append(links)
+        cached = hashlib.sha1(repr(signature).encode()).hexdigest()
+        _node_tree_hash_cache[key] = cached
+    return cached
+
+def material_hash(material, images=True):
+    key = (material.as_pointer(), images)
+    cached = _material_hash_cache.get(key)
+    if cached is None:
+        # The node tree is a pointer property on the material, so it's part of the signature through node_tree_hash
+        cached = hashlib.sha1(repr(_property_signature(material, images=images)).encode()).hexdigest()
+        _material_hash_cache[key] = cached
+    return cached
+
+# Maps every duplicate material to the one it should be replaced with - the first by name, so Body wins over Body.001
+def find_duplicate_materials(materials):
+    groups = {}
+    for material in sorted(materials, key=lambda material: material.name_full):
+        groups.setdefault(material_hash(material), []).append(material)
+    return {duplicate: group[0] for group in groups.values() for duplicate in group[1:]}
+
+@persistent
+def material_images_depsgraph_update(scene, depsgraph):
+    for update in depsgraph.updates:
+        id_data = update.id.original
+        if isinstance(id_data, bpy.types.Material):
+            _material_images_cache.pop(id_data.as_pointer(), None)
+            if id_data.node_tree:
+                _node_tree_cache.pop(id_data.node_tree.as_pointer(), None)
+            for images in (True, False):
+                _material_hash_cache.pop((id_data.as_pointer(), images), None)
+                if id_data.node_tree:
+                    _node_tree_hash_cache.pop((id_data.node_tree.as_pointer(), images), None)
+        elif isinstance(id_data, bpy.types.NodeTree):
+            _node_tree_cache.pop(id_data.as_pointer(), None)
+            # Any material could be using this group somewhere down the line, resolved sets / hashes are cheap to rebuild from the tree caches
+            _material_images_cache.clear()
+            _node_tree_hash_cache.clear()
+            _material_hash_cache.clear()
+
+@persistent
+def material_images_reset_cache(*args):
+    clear_material_images_cache()
+
+# Material slot remapping
+## Rebuilds a mesh's material slots in one go - every polygon's material index is read with a single foreach_get, pushed through an old slot -> new slot lookup table and written back with a single foreach_set.
+## No bpy.ops.object.material_slot_remove, which remaps the whole mesh once per removed slot and needs a context override per object.
+### Slots can be linked to the object instead of the mesh, and meshes can be shared between objects, so slot links are restored for every object using the mesh.
+
+def get_material_indices(mesh):
+    polygon_count = len(mesh.polygons)
+    indices = np.empty(polygon_count, dtype=np.int32) if np is not None else [0] * polygon_count
+    mesh.polygons.foreach_get("material_index", indices)
+    return indices
+
+def get_used_slots(indices, slot_count):
+    # Blender treats indices past the last slot as the last slot
+    if np is not None:
+        return {int(index) for index in np.unique(np.minimum(indices, slot_count - 1))}
+    return {min(index, slot_count - 1) for index in set(indices)}
+
+def get_mesh_users(objects):
+    users = {}
+    for obj in objects:
+        if obj.type == 'MESH':
+            users.setdefault(obj.data, []).append(obj)
+    return users
+
+def remap_material_slots(mesh, users, keep, slot_map, indices=None):
+    # keep: old slot indices that stay, in their new order. slot_map: new slot index for every old slot.
+    if indices is None:
+        indices = get_material_indices(mesh)
+    slot_count = len(slot_map)
+    data_materials = list(mesh.materials)
+    object_links = [[(slot.link, slot.material) for slot in user.material_slots] for user in users]
+
+    mesh.materials.clear()
+    for old_index in keep:
+        mesh.materials.append(data_materials[old_index])
+    for user, links in zip(users, object_links):
+        for new_index, old_index in enumerate(keep):
+            link, material = links[old_index]
+            if link == 'OBJECT':
+                slot = user.material_slots[new_index]
+                slot.link = 'OBJECT'
+                slot.material = material
+
+    if slot_count and len(indices):
+        if np is not None:
+            lookup = np.asarray(slot_map, dtype=np.int32)
+            remapped = lookup[np.minimum(indices, slot_count - 1)]
+        else:
+            remapped = [slot_map[min(index, slot_count - 1)] for index in indices]
+        mesh.polygons.foreach_set("material_index", remapped)
+    mesh.update()
+
+def remove_unused_material_slots(mesh, users):
+    slot_count = len(mesh.materials)
+    if slot_count == 0:
+        return 0
+    indices = get_material_indices(mesh)
+    used = get_used_slots(indices, slot_count) if len(indices) else set()
+    if len(used) == slot_count:
+        return 0
+
+    keep = sorted(used)
+    slot_map = [0] * slot_count
+    for new_index, old_index in enumerate(keep):
+        slot_map[old_index] = new_index
+    remap_material_slots(mesh, users, keep, slot_map, indices)
+    return slot_count - len(keep)
 
 class VVTools_OT_RemoveUnusedMaterials(Operator):
     bl_idname = "vv_tools.remove_unused_materials"
@@ -11,28 +277,18 @@ class VVTools_OT_RemoveUnusedMaterials(Operator):
 
     warning_shown = False
 
-    def remove_unused_materials(self, obj):
-        used_materials = set()
-
-        # Collect used materials
-        for poly in obj.data.polygons:
-            used_materials.add(poly.material_index)
-
-        # Remove unused materials
-        removed_count = 0
-        for i, mat_slot in reversed(list(enumerate(obj.material_slots))):
-            if i not in used_materials:
-                obj.active_material_index = i
-                bpy.ops.object.material_slot_remove({'object': obj})
-                removed_count += 1
+    def execute(self, context):
+        # Mesh data written from here would be overwritten when leaving Edit Mode
+        if context.mode == 'EDIT_MESH':
+            bpy.ops.object.mode_set(mode='OBJECT')
 
-        return removed_count
+        # Shared meshes are only processed once, with every object using them (selected or not) getting its slot links restored
+        selected_meshes = {obj.data for obj in context.selected_objects if obj.type == 'MESH' and obj.data.library is None}
+        users = get_mesh_users(bpy.data.objects)
 
-    def execute(self, context):
         total_removed = 0
-        for obj in bpy.context.selected_objects:
-            if obj.type == 'MESH':
-                total_removed += self.remove_unused_materials(obj)
+        for mesh in selected_meshes:
+            total_removed += remove_unused_material_slots(mesh, users[mesh])
 
         self.report({"INFO"}, f"{total_removed} unused materials removed")
         return {"FINISHED"}
@@ -50,38 +306,586 @@ class VVTools_OT_RemoveUnusedMaterials(Operator):
             col.label(text="consider adding a Fake User (Shield Icon) to them first.")
 
 
+def merge_duplicate_material_slots(mesh, users, duplicates):
+    slot_count = len(mesh.materials)
+    if slot_count == 0:
+        return 0
+
+    # Swap duplicates for their original first, on the mesh and on object-linked slots
+    for index, material in enumerate(mesh.materials):
+        if material in duplicates:
+            mesh.materials[index] = duplicates[material]
+    for user in users:
+        for slot in user.material_slots:
+            if slot.link == 'OBJECT' and slot.material in duplicates:
+                slot.material = duplicates[slot.material]
+
+    # Slots can only be merged if they end up with the same material on every object using the mesh
+    slot_keys = list(zip(*(
+        [(slot.link, slot.material.name_full if slot.material else None) for slot in user.material_slots]
+        for user in users
+    )))
+    keep = []
+    slot_map = []
+    first_slots = {}
+    for index, slot_key in enumerate(slot_keys):
+        if slot_key not in first_slots:
+            first_slots[slot_key] = len(keep)
+            keep.append(index)
+        slot_map.append(first_slots[slot_key])
+
+    if len(keep) == slot_count:
+        return 0
+    remap_material_slots(mesh, users, keep, slot_map)
+    return slot_count - len(keep)
+
+class VVTools_OT_MergeDuplicateMaterials(Operator):
+    bl_idname = "vv_tools.merge_duplicate_materials"
+    bl_label = "Merge Duplicate Materials"
+    bl_description = "Replace identical copies of materials (eg. Body.001, Body.002) with the original, and merge the material slots that end up using the same material"
+    bl_options = {'REGISTER', 'UNDO', 'INTERNAL'}
+
+    selected_only: bpy.props.BoolProperty(
+        name="Selected Only",
+        description="Only merge slots on the selected objects. Duplicates are still looked for across the whole file",
+        default=True,
+    )
+
+    def execute(self, context):
+        if context.mode == 'EDIT_MESH':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        duplicates = find_duplicate_materials(bpy.data.materials)
+        if not duplicates:
+            self.report({"INFO"}, "No duplicate materials found")
+            return {"FINISHED"}
+
+        users = get_mesh_users(bpy.data.objects)
+        objects = context.selected_objects if self.selected_only else bpy.data.objects
+        meshes = {obj.data for obj in objects if obj.type == 'MESH' and obj.data.library is None}
+
+        merged_slots = 0
+        for mesh in meshes:
+            merged_slots += merge_duplicate_material_slots(mesh, users[mesh], duplicates)
+
+        self.report({"INFO"}, f"{len(duplicates)} duplicate materials found, {merged_slots} material slots merged")
+        return {"FINISHED"}
+
+
+# Image file change detection
+## Keeps the (mtime, size) of every image file we've seen, so reloading can skip files that haven't changed on disk.
+## Stats are taken for every image when a file is opened, which is the point Blender read them. Images we've never seen count as changed.
+### Only stat() calls, no pixels are read.
+
+_image_file_stats = {}
+
+# Absolute path of a single file image, None for packed / generated / render result images.
+## UDIM and sequence / movie images are None too - their filepath is a <UDIM> pattern or a single frame, not the files actually used.
+def get_image_filepath(image):
+    if image.source != 'FILE' or image.packed_file is not None or not image.filepath:
+        return None
+    return os.path.normpath(bpy.path.abspath(image.filepath, library=image.library))
+
+# UDIMs, sequences and movies can't be checked with a single stat, so they're always reloaded
+def is_multi_file_image(image):
+    return image.source in {'TILED', 'SEQUENCE', 'MOVIE'} and image.packed_file is None and bool(image.filepath)
+
+def stat_image_file(filepath):
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def image_file_changed(image, filepath, stat):
+    return _image_file_stats.get(image.as_pointer()) != (filepath, stat)
+
+def record_image_file_stat(image, filepath, stat):
+    _image_file_stats[image.as_pointer()] = (filepath, stat)
+
+@persistent
+def image_file_stats_baseline(*args):
+    _image_file_stats.clear()
+    for image in bpy.data.images:
+        filepath = get_image_filepath(image)
+        if filepath is not None:
+            record_image_file_stat(image, filepath, stat_image_file(filepath))
+
+# Reads a file into nothing, so it's in the OS file cache by the time Blender reloads it
+def prefetch_file(filepath, chunk_size=1 << 20):
+    try:
+        with open(filepath, "rb") as f:
+            while f.read(chunk_size):
+                pass
+    except OSError:
+        pass
+
+# Reloads the changed images in one pass. Returns (reloaded, missing) image counts.
+## Image files are stat'd and prefetched on a thread pool so disk / network I/O overlaps, the reloads themselves have to stay on the main thread.
+def reload_images(images, force=False, max_workers=8):
+    images = list(images)
+    multi_file = [image for image in images if is_multi_file_image(image) and image.has_data]
+    for image in multi_file:
+        image.reload()
+
+    candidates = [(image, get_image_filepath(image)) for image in images]
+    candidates = [(image, filepath) for image, filepath in candidates if filepath is not None]
+    if not candidates:
+        return len(multi_file), 0
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(candidates))) as pool:
+        stats = list(pool.map(stat_image_file, [filepath for _, filepath in candidates]))
+
+        changed = []
+        missing = 0
+        for (image, filepath), stat in zip(candidates, stats):
+            if stat is None:
+                missing += 1
+            elif force or image_file_changed(image, filepath, stat):
+                changed.append((image, filepath, stat))
+
+        # Images that were never loaded get read fresh from disk the next time they're used anyway
+        reloaded = 0
+        loaded = [(image, filepath, stat) for image, filepath, stat in changed if image.has_data]
+        for image, filepath, stat in changed:
+            if not image.has_data:
+                record_image_file_stat(image, filepath, stat)
+
+        # map() hands the prefetches back in order, so each reload only waits for its own file while the rest keep loading
+        for (image, filepath, stat), _ in zip(loaded, pool.map(prefetch_file, [filepath for _, filepath, _ in loaded])):
+            image.reload()
+            record_image_file_stat(image, filepath, stat)
+            reloaded += 1
+
+    return reloaded + len(multi_file), missing
+
+
+# Texture hot reload
+## Opt-in watcher for textures being re-exported from Substance etc. A timer checks the image files used by the scene and reloads the ones that changed.
+## Each tick only stats a handful of images (Images per Tick), working through the list round robin, so the cost per tick stays the same however many images the scene has.
+### Changes are collected over a whole round and reloaded together at the end of it, sharing the stat cache with Reload Textures.
+
+_watch_state = {
+    'queue': [],
+    'position': 0,
+    'changed': set(),
+}
+
+def _watched_image_names(scene):
+    return sorted(image.name for image in get_objects_images(scene.objects) if image.library is None and get_image_filepath(image))
+
+def tag_image_views_redraw():
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type in {'VIEW_3D', 'IMAGE_EDITOR', 'NODE_EDITOR'}:
+                area.tag_redraw()
+
+def texture_watch_tick():
+    scene = bpy.context.scene
+    if scene is None or not scene.vv_tools_texture_watch:
+        return None
+
+    state = _watch_state
+    if state['position'] >= len(state['queue']):
+        # End of a round - reload everything that changed in one go, then start over with a fresh image list
+        images = [bpy.data.images.get(name) for name in sorted(state['changed'])]
+        state['changed'] = set()
+        reloaded, _ = reload_images([image for image in images if image is not None])
+        if reloaded:
+            print(f"VV Tools: hot reloaded {reloaded} textures")
+            tag_image_views_redraw()
+        state['queue'] = _watched_image_names(scene)
+        state['position'] = 0
+
+    end = state['position'] + scene.vv_tools_texture_watch_batch
+    for name in state['queue'][state['position']:end]:
+        image = bpy.data.images.get(name)
+        if image is None or not image.has_data:
+            continue
+        filepath = get_image_filepath(image)
+        if filepath is None:
+            continue
+        stat = stat_image_file(filepath)
+        if stat is None:
+            continue
+        # First time we see an image (added since the file was opened) it's taken as up to date
+        if image.as_pointer() not in _image_file_stats:
+            record_image_file_stat(image, filepath, stat)
+        elif image_file_changed(image, filepath, stat):
+            state['changed'].add(name)
+    state['position'] = end
+
+    return scene.vv_tools_texture_watch_interval
+
+def start_texture_watch():
+    _watch_state['queue'] = []
+    _watch_state['position'] = 0
+    _watch_state['changed'] = set()
+    if not bpy.app.timers.is_registered(texture_watch_tick):
+        bpy.app.timers.register(texture_watch_tick, first_interval=0.0)
+
+def stop_texture_watch():
+    if bpy.app.timers.is_registered(texture_watch_tick):
+        bpy.app.timers.unregister(texture_watch_tick)
+
+def update_texture_watch(self, context):
+    if self.vv_tools_texture_watch:
+        start_texture_watch()
+    else:
+        stop_texture_watch()
+
+# Timers don't survive loading another file, pick the watcher back up if the file had it on
+@persistent
+def texture_watch_load(*args):
+    scene = bpy.context.scene
+    if scene is not None and scene.vv_tools_texture_watch:
+        start_texture_watch()
+    else:
+        stop_texture_watch()
+
+
 class VVTools_OT_ReloadTexturesOfSelected(Operator):
     bl_idname = "vv_tools.reload_textures_of_selected"
     bl_label = "Reload Textures of Selected"
-    bl_description = "Reload all textures in materials of the selected objects. WARNING! Can run slow."
+    bl_description = "Reload the textures in materials of the selected objects that changed on disk"
     bl_options = {"REGISTER", "UNDO", "INTERNAL"}
 
+    force: bpy.props.BoolProperty(
+        name="Force",
+        description="Reload every texture, even ones that haven't changed on disk",
+        default=False,
+    )
+
     def reload_textures(self, objects):
-        for obj in objects:
-            for slot in obj.material_slots:
-                if slot.material:
-                    for node in slot.material.node_tree.nodes:
-                        if node.type == 'TEX_IMAGE':
-                            node.image.reload()
+        # Each image only needs reloading once, no matter how many slots / objects share it
+        return reload_images(get_objects_images(objects), self.force)
 
     def execute(self, context):
         selected_objects = context.selected_objects
-        self.reload_textures(selected_objects)
+        reloaded, missing = self.reload_textures(selected_objects)
+        message = f"{reloaded} textures reloaded"
+        if missing:
+            message += f", {missing} missing on disk"
+        self.report({"WARNING"} if missing else {"INFO"}, message)
         return {"FINISHED"}
 
 
 
+# Texture atlas builder
+## Packs the textures of the selected objects' materials into atlas textures, moves the UVs onto the atlas and merges the material slots.
+## Materials are grouped by their shader - same nodes, links, settings, Value / RGB node values and mute state with only the images differing (material_hash with images=False). Each group gets its own atlas material, a copy of one of its materials, so nothing but the textures changes.
+## Every Image Texture node in a group is a role (base colour, normal, roughness, mask...) and gets its own atlas, all roles of a group sharing one layout, so each UV lands on matching pixels in every texture.
+## Sizes come from the image file headers, the packing is done up front (atlaspacker.py), then every atlas is filled one source image at a time with NumPy and the source is freed again if it wasn't loaded before.
+### Left alone: materials with UVs outside 0-1 (tiling textures), used in object-linked slots, with images inside node groups or with mapped texture coordinates (linked Vector input).
+### Float sources (16-bit PNG, EXR...) are stored linear, they're converted back to sRGB for sRGB roles and copied as is for Non-Color ones. Float sources in any other colour space are left alone.
+
+ATLAS_UV_TOLERANCE = 0.001
+
+# The Image Texture nodes of a material sorted by name - the order matches node_tree_hash, so the same index is the same role across a group. None if it can't be atlased.
+def get_atlas_image_nodes(material):
+    if material is None or not material.use_nodes or material.node_tree is None:
+        return None
+    nodes = sorted((node for node in material.node_tree.nodes if node.type == 'TEX_IMAGE'), key=lambda node: node.name)
+    if not nodes:
+        return None
+    for node in nodes:
+        image = node.image
+        if image is None or image.source not in {'FILE', 'GENERATED'} or node.inputs["Vector"].is_linked:
+            return None
+        if image.is_float and not image.colorspace_settings.is_data and image.colorspace_settings.name != 'sRGB':
+            return None
+    if get_material_images(material) - {node.image for node in nodes}:
+        return None
+    return nodes
+
+def get_image_size(image):
+    filepath = get_image_filepath(image)
+    header = read_image_header(filepath) if filepath else None
+    if header is not None:
+        return header.width, header.height
+    was_loaded = image.has_data
+    width, height = image.size
+    if not was_loaded:
+        image.buffers_free()
+    return width, height
+
+def linear_to_srgb(rgb):
+    rgb = np.clip(rgb, 0.0, 1.0)
+    return np.where(rgb <= 0.0031308, rgb * 12.92, 1.055 * np.power(rgb, 1.0 / 2.4) - 0.055)
+
+# (height, width, 4) float32 pixels of an image, as they'd be stored in a byte image
+def read_image_pixels(image):
+    was_loaded = image.has_data
+    width, height = image.size
+    channels = image.channels
+    is_float = image.is_float
+    pixels = np.empty(width * height * channels, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    if not was_loaded:
+        image.buffers_free()
+
+    pixels = pixels.reshape(height, width, channels)
+    if channels == 4:
+        rgba = pixels
+    else:
+        rgba = np.ones((height, width, 4), dtype=np.float32)
+        rgba[..., :3] = pixels[..., :3] if channels >= 3 else pixels[..., :1]
+        if channels == 2:
+            rgba[..., 3] = pixels[..., 1]
+    if is_float and not image.colorspace_settings.is_data:
+        rgba[..., :3] = linear_to_srgb(rgba[..., :3])
+    return rgba
+
+# Scales pixels to the tile size - box filter for whole number factors (the usual power of two case), nearest otherwise
+def resize_pixels(pixels, width, height):
+    source_height, source_width = pixels.shape[:2]
+    if (source_width, source_height) == (width, height):
+        return pixels
+    if source_width % width == 0 and source_height % height == 0:
+        x_factor, y_factor = source_width // width, source_height // height
+        return pixels.reshape(height, y_factor, width, x_factor, 4).mean(axis=(1, 3))
+    rows = (np.arange(height) * source_height) // height
+    columns = (np.arange(width) * source_width) // width
+    return pixels[rows[:, None], columns]
+
+def get_loop_slots(mesh, slot_count):
+    indices = np.minimum(get_material_indices(mesh), slot_count - 1)
+    loop_starts = np.empty(len(mesh.polygons), dtype=np.int32)
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    order = np.argsort(loop_starts, kind='stable')
+    return np.repeat(indices[order], loop_totals[order])
+
+def get_render_uv_layer(mesh):
+    return next((layer for layer in mesh.uv_layers if layer.active_render), mesh.uv_layers.active)
+
+def get_tile_size(images, atlas_size, padding):
+    # Biggest of the role sizes, scaled down by powers of two if it's too big for the atlas
+    sizes = [get_image_size(image) for image in images]
+    width = max(width for width, _ in sizes)
+    height = max(height for _, height in sizes)
+    if width <= 0 or height <= 0:
+        return None
+    factor = 1
+    while max(width, height) // factor + 2 * padding > atlas_size:
+        factor *= 2
+    return max(width // factor, 1), max(height // factor, 1)
+
+def fill_atlas_page(tiles, placements, page_index, page_size, role, padding):
+    page_width, page_height = page_size
+    atlas = np.zeros((page_height, page_width, 4), dtype=np.float32)
+    for key, placement in placements.items():
+        if placement.page != page_index:
+            continue
+        images, width, height = tiles[key]
+        tile = resize_pixels(read_image_pixels(images[role]), width, height)
+        if padding:
+            # Bleed the edge pixels into the padding so filtering / mip maps don't pick up neighbouring tiles
+            tile = np.pad(tile, ((padding, padding), (padding, padding), (0, 0)), mode='edge')
+        atlas[placement.y:placement.y + placement.height, placement.x:placement.x + placement.width] = tile
+    return atlas
+
+def build_texture_atlas(meshes, users, atlas_size=4096, padding=4):
+    # Returns (atlased materials, atlas images, merged slots, skipped materials)
+
+    # Gather what's on every mesh, and which materials can't be atlased
+    mesh_data = []
+    excluded = set()
+    for mesh in meshes:
+        uv_layer = get_render_uv_layer(mesh)
+        materials = list(mesh.materials)
+        if uv_layer is None or not materials or not len(mesh.loops):
+            continue
+        for user in users[mesh]:
+            excluded.update(slot.material for slot in user.material_slots if slot.link == 'OBJECT')
+
+        loop_slots = get_loop_slots(mesh, len(materials))
+        uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        uv_layer.data.foreach_get("uv", uvs)
+        uvs = uvs.reshape(-1, 2)
+        for slot_index, material in enumerate(materials):
+            slot_uvs = uvs[loop_slots == slot_index]
+            if len(slot_uvs) and (slot_uvs.min() < -ATLAS_UV_TOLERANCE or slot_uvs.max() > 1.0 + ATLAS_UV_TOLERANCE):
+                excluded.add(material)
+        mesh_data.append((mesh, uv_layer, materials, loop_slots, uvs))
+
+    material_nodes = {}
+    for _, _, materials, _, _ in mesh_data:
+        for material in materials:
+            if material is None or material in excluded or material in material_nodes:
+                continue
+            nodes = get_atlas_image_nodes(material)
+            if nodes is None:
+                excluded.add(material)
+            else:
+                material_nodes[material] = nodes
+
+    # Group by shader, images aside
+    groups = {}
+    for material in sorted(material_nodes, key=lambda material: material.name_full):
+        groups.setdefault(material_hash(material, images=False), []).append(material)
+
+    atlas_images = []
+    replacements = {}
+    transforms = {}
+    for materials in groups.values():
+        # One rectangle per combination of images, materials using the same ones share it
+        tiles = {}
+        material_keys = {}
+        for material in materials:
+            images = tuple(node.image for node in material_nodes[material])
+            key = tuple(image.name_full for image in images)
+            if key not in tiles:
+                size = get_tile_size(images, atlas_size, padding)
+                if size is None:
+                    continue
+                tiles[key] = (images, *size)
+            material_keys[material] = key
+        if len(tiles) < 2:
+            continue
+
+        placements, page_sizes = pack_rectangles({key: (width + 2 * padding, height + 2 * padding) for key, (_, width, height) in tiles.items()}, atlas_size)
+        placements = {placement.key: placement for placement in placements}
+
+        # Fill one page and role at a time, one source image at a time. The atlas material is a copy of the first material on the page with every role pointed at its atlas.
+        page_materials = []
+        for page_index, page_size in enumerate(page_sizes):
+            template = next(material for material in materials if material in material_keys and placements[material_keys[material]].page == page_index)
+            atlas_material = template.copy()
+            atlas_material.name = "VV_Atlas"
+            for role, node in enumerate(material_nodes[template]):
+                atlas = fill_atlas_page(tiles, placements, page_index, page_size, role, padding)
+                atlas_image = bpy.data.images.new("VV_Atlas", page_size[0], page_size[1], alpha=True)
+                atlas_image.colorspace_settings.name = node.image.colorspace_settings.name
+                atlas_image.pixels.foreach_set(atlas.ravel())
+                atlas_image.pack()
+                atlas_images.append(atlas_image)
+                atlas_material.node_tree.nodes[node.name].image = atlas_image
+                del atlas
+            page_materials.append(atlas_material)
+
+        for material, key in material_keys.items():
+            placement = placements[key]
+            _, width, height = tiles[key]
+            page_width, page_height = page_sizes[placement.page]
+            replacements[material] = page_materials[placement.page]
+            transforms[material] = ((width / page_width, height / page_height), ((placement.x + padding) / page_width, (placement.y + padding) / page_height))
+
+    skipped = len({material for material in excluded if material is not None})
+    if not replacements:
+        return 0, [], 0, skipped
+
+    # Move the UVs onto the atlas - one scale / offset per slot, applied to every loop at once
+    merged_slots = 0
+    for mesh, uv_layer, materials, loop_slots, uvs in mesh_data:
+        scale = np.ones((len(materials), 2), dtype=np.float32)
+        offset = np.zeros((len(materials), 2), dtype=np.float32)
+        for slot_index, material in enumerate(materials):
+            if material in transforms:
+                scale[slot_index], offset[slot_index] = transforms[material]
+        uv_layer.data.foreach_set("uv", (uvs * scale[loop_slots] + offset[loop_slots]).ravel())
+        merged_slots += merge_duplicate_material_slots(mesh, users[mesh], replacements)
+
+    return len(replacements), atlas_images, merged_slots, skipped
+
+class VVTools_OT_BuildTextureAtlas(Operator):
+    bl_idname = "vv_tools.build_texture_atlas"
+    bl_label = "Build Texture Atlas"
+    bl_description = "Pack the textures of the selected objects' materials into atlas textures, move the UVs onto the atlas and merge the material slots"
+    bl_options = {'REGISTER', 'UNDO', 'INTERNAL'}
+
+    atlas_size: bpy.props.EnumProperty(
+        name="Atlas Size",
+        description="Maximum atlas texture size. Textures that don't fit on one atlas go onto another",
+        items=[(str(size), str(size), "") for size in (1024, 2048, 4096, 8192)],
+        default='4096',
+    )
+    padding: bpy.props.IntProperty(
+        name="Padding",
+        description="Pixels around each texture on the atlas, filled with its edge pixels",
+        default=4,
+        min=0,
+        soft_max=32,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return np is not None and any(obj.type == 'MESH' for obj in context.selected_objects)
+
+    def execute(self, context):
+        if context.mode == 'EDIT_MESH':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        meshes = {obj.data for obj in context.selected_objects if obj.type == 'MESH' and obj.data.library is None}
+        users = get_mesh_users(bpy.data.objects)
+        atlased, atlas_images, merged_slots, skipped = build_texture_atlas(meshes, users, int(self.atlas_size), self.padding)
+
+        if not atlased:
+            self.report({"WARNING"}, "Nothing to atlas - needs at least two materials with the same shader, different textures and UVs inside 0-1")
+            return {"CANCELLED"}
+        message = f"{atlased} materials packed into {len(atlas_images)} atlas textures, {merged_slots} material slots merged"
+        if skipped:
+            message += f", {skipped} materials skipped (tiling UVs or object-linked)"
+        self.report({"INFO"}, message)
+        return {"FINISHED"}
+
+
 # Class list for registration in __init__.py
 classes = [
     VVTools_OT_RemoveUnusedMaterials,
+    VVTools_OT_MergeDuplicateMaterials,
+    VVTools_OT_BuildTextureAtlas,
     VVTools_OT_ReloadTexturesOfSelected,
 ]
 
+handlers = [
+    (bpy.app.handlers.depsgraph_update_post, material_images_depsgraph_update),
+    (bpy.app.handlers.load_post, material_images_reset_cache),
+    (bpy.app.handlers.load_post, image_file_stats_baseline),
+    (bpy.app.handlers.load_post, texture_watch_load),
+    (bpy.app.handlers.undo_post, material_images_reset_cache),
+    (bpy.app.handlers.redo_post, material_images_reset_cache),
+]
+
 def register():
     for cls in classes:
         bpy.utils.register_class(cls)
+    bpy.types.Scene.vv_tools_texture_watch = bpy.props.BoolProperty(
+        name="Hot Reload Textures",
+        description="Watch the texture files used in the scene and reload them automatically when they change on disk",
+        default=False,
+        update=update_texture_watch,
+    )
+    bpy.types.Scene.vv_tools_texture_watch_interval = bpy.props.FloatProperty(
+        name="Interval",
+        description="Time in seconds between texture file checks",
+        default=1.0,
+        min=0.1,
+        soft_max=10.0,
+        subtype='TIME',
+        unit='TIME',
+    )
+    bpy.types.Scene.vv_tools_texture_watch_batch = bpy.props.IntProperty(
+        name="Images per Tick",
+        description="Maximum number of texture files checked per interval. A full pass over the scene's textures is spread over several intervals",
+        default=32,
+        min=1,
+        soft_max=256,
+    )
+    for handler_list, handler in handlers:
+        if handler not in handler_list:
+            handler_list.append(handler)
 
 def unregister():
+    for handler_list, handler in reversed(handlers):
+        if handler in handler_list:
+            handler_list.remove(handler)
+    clear_material_images_cache()
+    stop_texture_watch()
+    del bpy.types.Scene.vv_tools_texture_watch_batch
+    del bpy.types.Scene.vv_tools_texture_watch_interval
+    del bpy.types.Scene.vv_tools_texture_watch
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
 
@@ -6,49 +6,569 @@
 
 import bpy
 import json
+import os
+import re
+import time
+from bisect import bisect_left
+from bpy.app.handlers import persistent
 from bpy.types import Operator, Panel
+from ..imageheaders import read_image_header
+from ..vrcreport import REPORT_VERSION, write_report
+from .materialsops import get_material_images
 
-def performance_rank(statistics):
-    ranks = [
-        ('Excellent', {'triangles': 32000, 'texture_memory': 40 * 1024 * 1024, 'skinned_meshes': 1, 'meshes': 4, 'material_slots': 4, 'bones': 75}),
-        ('Good', {'triangles': 70000, 'texture_memory': 75 * 1024 * 1024, 'skinned_meshes': 2, 'meshes': 8, 'material_slots': 8, 'bones': 150}),
-        ('Medium', {'triangles': 70000, 'texture_memory': 110 * 1024 * 1024, 'skinned_meshes': 8, 'meshes': 16, 'material_slots': 16, 'bones': 256}),
-        ('Poor', {'triangles': 70000, 'texture_memory': 150 * 1024 * 1024, 'skinned_meshes': 16, 'meshes': 24, 'material_slots': 32, 'bones': 400}),
-        ('Very Poor', {}),
-    ]
-    
+# NumPy ships with Blender, but keep a pure Python path around in case someone is running a stripped build.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Performance rank profiles
+## Limits live in rank_profiles.json rather than in code - one profile per platform, each statistic lists the upper limit of every rank except the last (Very Poor).
+## Custom studio budgets can be added with a JSON file in the same format (set in the VRC panel), they're merged over the built in profiles.
+### Profiles are compiled once into sorted threshold lists, so ranking is a single bisect per statistic.
+### Files are only looked at again when the Custom Profiles setting changes or new results are published - draw code uses get_active_rank_profiles, which never touches the disk.
+
+RANK_PROFILES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rank_profiles.json")
+DEFAULT_PROFILE = 'PC'
+
+_profile_file_cache = {}
+_compiled_profiles = {}
+
+# Returns (mtime, data). Failures are cached on (path, mtime) as well, so a broken custom file is only reported once rather than on every call.
+# Anything that isn't a JSON object counts as a failure, data is always a dict or None.
+def _load_profile_file(filepath):
+    error = None
+    try:
+        mtime = os.stat(filepath).st_mtime_ns
+    except OSError as e:
+        mtime, error = None, e
+    cached = _profile_file_cache.get(filepath)
+    if cached is None or cached[0] != mtime:
+        data = None
+        if mtime is not None:
+            try:
+                with open(filepath) as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                error = e
+            if data is not None and not isinstance(data, dict):
+                error = f"expected a JSON object, got {type(data).__name__}"
+                data = None
+            elif data is None and error is None:
+                error = "expected a JSON object, got null"
+        if data is None:
+            print(f"VV Tools: could not load rank profiles from {filepath}: {error}")
+        cached = (mtime, data)
+        _profile_file_cache[filepath] = cached
+    return cached
+
+def compile_rank_profiles(data, profiles=None):
+    profiles = {} if profiles is None else dict(profiles)
+    default_ranks = data.get("ranks", ["Excellent", "Good", "Medium", "Poor", "Very Poor"])
+    default_warnings = data.get("warnings", {})
+    for profile_id, profile in data.get("profiles", {}).items():
+        ranks = profile.get("ranks", default_ranks)
+        thresholds = {}
+        for stat, limits in profile["limits"].items():
+            if len(limits) != len(ranks) - 1:
+                raise ValueError(f"Profile {profile_id}: {stat} needs {len(ranks) - 1} limits, got {len(limits)}")
+            thresholds[stat] = sorted(limits)
+        warnings = dict(default_warnings)
+        warnings.update(profile.get("warnings", {}))
+        profiles[profile_id] = {
+            'id': profile_id,
+            'label': profile.get("label", profile_id),
+            'description': profile.get("description", ""),
+            'ranks': ranks,
+            'thresholds': thresholds,
+            'warnings': warnings,
+        }
+    return profiles
+
+# Returns the same compiled dict for as long as the profile files don't change, so callers can cache against it.
+def get_rank_profiles(custom_path=""):
+    builtin_mtime, builtin_data = _load_profile_file(RANK_PROFILES_PATH)
+    if builtin_data is None:
+        raise FileNotFoundError(f"Built in rank profiles missing or broken: {RANK_PROFILES_PATH}")
+    custom_mtime, custom_data = None, None
+    if custom_path:
+        custom_mtime, custom_data = _load_profile_file(bpy.path.abspath(custom_path))
+
+    key = (builtin_mtime, custom_path, custom_mtime)
+    profiles = _compiled_profiles.get(key)
+    if profiles is None:
+        profiles = compile_rank_profiles(builtin_data)
+        if custom_data is not None:
+            try:
+                profiles = compile_rank_profiles(custom_data, profiles)
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                print(f"VV Tools: invalid custom rank profiles in {custom_path}: {e}")
+        _compiled_profiles.clear()
+        _compiled_profiles[key] = profiles
+    return profiles
+
+_active_profiles = {}
+
+# Re-reads the profile files for the scene's Custom Profiles setting. Called when the setting changes and when results are published.
+def resolve_rank_profiles(scene):
+    custom_path = scene.vv_tools_vrc_custom_profiles
+    profiles = get_rank_profiles(custom_path)
+    _active_profiles.clear()
+    _active_profiles[custom_path] = profiles
+    return profiles
+
+# For draw code - the profiles resolved last, only going to disk if the setting changed since
+def get_active_rank_profiles(scene):
+    profiles = _active_profiles.get(scene.vv_tools_vrc_custom_profiles)
+    if profiles is None:
+        profiles = resolve_rank_profiles(scene)
+    return profiles
+
+def update_custom_profiles(self, context):
+    resolve_rank_profiles(self)
+
+def performance_rank(statistics, profile=DEFAULT_PROFILE, profiles=None):
+    profile = (profiles or get_rank_profiles())[profile]
     rank_index = 0
-    for key, value in statistics.items():
-        for i, (rank, limits) in enumerate(ranks[:-1]):
-            if value > limits[key]:
-                rank_index = max(rank_index, i + 1)
-    
-    return ranks[rank_index][0]
-
-def performance_warning(statistics):
+    for stat, thresholds in profile['thresholds'].items():
+        rank_index = max(rank_index, bisect_left(thresholds, statistics.get(stat, 0)))
+    return profile['ranks'][rank_index]
+
+# Warnings are shown for anything past the last limit, ie. anything that pushes the avatar into Very Poor.
+def performance_warning(statistics, profile=DEFAULT_PROFILE, profiles=None):
+    profile = (profiles or get_rank_profiles())[profile]
     warnings = []
+    for stat, thresholds in profile['thresholds'].items():
+        if statistics.get(stat, 0) > thresholds[-1] and stat in profile['warnings']:
+            warnings.append(profile['warnings'][stat])
+    return warnings
 
-    if statistics['triangles'] > 70000:
-        warnings.append("Polygon count is high. Consider dissolving unnecessary geometry, decimation, or removing unnecessary geometry entirely.")
+# Triangle count of a mesh. Every polygon with n corners triangulates to n - 2 tris, so the total is (sum of loop totals) - 2 * (polygon count).
+## Reads all loop totals in one foreach_get call rather than touching every polygon from Python, which is the bulk of the runtime on heavy meshes.
 
-    if statistics['texture_memory'] > 150 * 1024 * 1024:
-        warnings.append("Detected VRAM is high! Consider reducing texture resolution, or using VRAM reduction techniques in Unity. If you are using high resolution source textures, remember Unity will downres these to 2K on import.")
+def count_triangles(mesh):
+    polygon_count = len(mesh.polygons)
+    if polygon_count == 0:
+        return 0
 
-    if statistics['skinned_meshes'] > 16:
-        warnings.append("Skinned Mesh count is high. Consider merging skinned meshes as appropriate, or offloading things like outfit changes to a different avatar entirely.")
-        
-    if statistics['meshes'] > 24:
-        warnings.append("Meshes count is high. It is questionable why you need so many meshes, and you should consider merging them as appropriate, or removing them as appropriate.")
+    if np is not None:
+        loop_totals = np.empty(polygon_count, dtype=np.int32)
+        mesh.polygons.foreach_get("loop_total", loop_totals)
+        return int(loop_totals.sum(dtype=np.int64)) - 2 * polygon_count
 
-    if statistics['material_slots'] > 32:
-        warnings.append("Material Count is very high. Check for duplicate entries, unused material slots, and atlas textures if required. If you can merge two meshes that share the exact same material, this stat will effectively be lowered.")
+    return sum(p.loop_total for p in mesh.polygons) - 2 * polygon_count
 
-    if statistics['bones'] > 400:
-        warnings.append("Bones count is very high. Check for duplicate or unused armatures, _end bones (leaf bones), zero weight bones and remove them as needed.")
+# Vertex buffers
+## GPUs (and Unity) don't have Blender's per-face-corner data - every unique combination of vertex, UVs and normal becomes its own vertex, so UV seams and sharp edges split vertices.
+## The split vertex count is worked out from the corner (loop) arrays of the evaluated mesh, pulled in bulk with foreach_get and packed into rows so NumPy can count unique rows in one go.
+### Byte sizes follow Unity's default layout for imported meshes: float3 position / normal, float4 tangent, float2 per UV map, Color32 vertex colours (Unity only keeps one set), and 4 bone weights + indices on skinned meshes.
 
-    return warnings
+VERTEX_ATTRIBUTE_BYTES = {
+    'position': 12,
+    'normal': 12,
+    'tangent': 16,
+    'uv': 8,
+    'color': 4,
+    'skin': 32,
+}
+MAX_UV_MAPS = 8 # Unity imports up to 8 UV channels
 
-def analyze_selected_objects():
+def _corner_normals(mesh, loop_count):
+    normals = np.empty(loop_count * 3, dtype=np.float32)
+    if hasattr(mesh, "corner_normals"): # Blender 4.1+
+        mesh.corner_normals.foreach_get("vector", normals)
+    else:
+        mesh.calc_normals_split()
+        mesh.loops.foreach_get("normal", normals)
+    return normals.reshape(-1, 3)
+
+def count_split_vertices(mesh, uv_count):
+    loop_count = len(mesh.loops)
+    if loop_count == 0:
+        return 0
+
+    if np is None:
+        if not hasattr(mesh, "corner_normals"):
+            mesh.calc_normals_split()
+        normals = mesh.corner_normals if hasattr(mesh, "corner_normals") else None
+        uv_data = [mesh.uv_layers[i].data for i in range(uv_count)]
+        return len({
+            (loop.vertex_index, tuple(normals[i].vector) if normals is not None else tuple(loop.normal), *(tuple(data[i].uv) for data in uv_data))
+            for i, loop in enumerate(mesh.loops)
+        })
+
+    attributes = [_corner_normals(mesh, loop_count)]
+    for i in range(uv_count):
+        uvs = np.empty(loop_count * 2, dtype=np.float32)
+        mesh.uv_layers[i].data.foreach_get("uv", uvs)
+        attributes.append(uvs.reshape(-1, 2))
+    vertex_indices = np.empty((loop_count, 1), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", vertex_indices.ravel())
+
+    # Adding 0.0 turns -0.0 into 0.0 so floats can be compared bitwise, then every row is viewed as one opaque blob for np.unique
+    attributes = np.hstack(attributes) + np.float32(0.0)
+    rows = np.ascontiguousarray(np.hstack((vertex_indices.view(np.uint32), attributes.view(np.uint32))))
+    rows = rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1])))
+    return int(np.unique(rows).size)
+
+def estimate_vertex_buffer(mesh, skinned):
+    uv_maps = len(mesh.uv_layers)
+    uv_count = min(uv_maps, MAX_UV_MAPS)
+    color_attributes = len(mesh.color_attributes) if hasattr(mesh, "color_attributes") else len(mesh.vertex_colors)
+    vertices = count_split_vertices(mesh, uv_count)
+
+    vertex_bytes = VERTEX_ATTRIBUTE_BYTES['position'] + VERTEX_ATTRIBUTE_BYTES['normal'] + VERTEX_ATTRIBUTE_BYTES['tangent']
+    vertex_bytes += VERTEX_ATTRIBUTE_BYTES['uv'] * uv_count
+    if color_attributes:
+        vertex_bytes += VERTEX_ATTRIBUTE_BYTES['color']
+    if skinned:
+        vertex_bytes += VERTEX_ATTRIBUTE_BYTES['skin']
+
+    return {
+        'vertices': vertices,
+        'uv_maps': uv_maps,
+        'color_attributes': color_attributes,
+        'vertex_buffer_memory': vertices * vertex_bytes,
+    }
+
+# Shape key (blendshape) memory
+## Unity only stores blendshape vertices that actually move, at roughly 40 bytes each (vertex index + position, normal and tangent deltas).
+## All key coordinates are pulled in bulk with foreach_get and diffed against the basis with NumPy, so even hundreds of keys on dense meshes only take milliseconds.
+### Reads the original mesh, since shape keys don't survive onto evaluated meshes.
+
+BLENDSHAPE_VERTEX_BYTES = 40
+SHAPE_KEY_EPSILON = 1e-6
+
+def estimate_shape_key_memory(mesh):
+    shape_keys = mesh.shape_keys
+    if shape_keys is None or len(shape_keys.key_blocks) < 2:
+        return 0, {}
+
+    basis = shape_keys.reference_key
+    vertex_count = len(mesh.vertices)
+    key_memory = {}
+
+    if np is not None:
+        basis_co = np.empty(vertex_count * 3, dtype=np.float32)
+        basis.data.foreach_get("co", basis_co)
+        basis_co = basis_co.reshape(-1, 3)
+        key_co = np.empty(vertex_count * 3, dtype=np.float32)
+        for key_block in shape_keys.key_blocks:
+            if key_block == basis:
+                continue
+            key_block.data.foreach_get("co", key_co)
+            moved = np.abs(key_co.reshape(-1, 3) - basis_co).max(axis=1) > SHAPE_KEY_EPSILON
+            key_memory[key_block.name] = int(np.count_nonzero(moved)) * BLENDSHAPE_VERTEX_BYTES
+    else:
+        basis_co = [point.co.copy() for point in basis.data]
+        for key_block in shape_keys.key_blocks:
+            if key_block == basis:
+                continue
+            moved = sum(1 for point, base in zip(key_block.data, basis_co) if (point.co - base).length > SHAPE_KEY_EPSILON)
+            key_memory[key_block.name] = moved * BLENDSHAPE_VERTEX_BYTES
+
+    return sum(key_memory.values()), key_memory
+
+# Weighted vertex groups
+## One pass over the mesh marks every vertex group with a non-zero weight in a bitmap (one byte per group), stopping as soon as every group is marked.
+### Blender doesn't expose deform weights through foreach_get, so this is the one place that has to walk vertices - the result is cached with the rest of the object's analysis, so it only runs again when the mesh changes.
+
+def get_weighted_group_indices(mesh, group_count):
+    if group_count == 0:
+        return []
+
+    weighted = bytearray(group_count)
+    remaining = group_count
+    for vertex in mesh.vertices:
+        for group in vertex.groups:
+            if group.weight > 0.0 and group.group < group_count and not weighted[group.group]:
+                weighted[group.group] = 1
+                remaining -= 1
+        if remaining == 0:
+            break
+
+    return [index for index in range(group_count) if weighted[index]]
+
+
+# Image dimensions for texture memory estimates.
+## Reads the file header on disk where we can, so Blender never has to load the pixels. Packed, generated, tiled etc images (or files we can't parse) fall back to img.size.
+
+def get_image_header(img):
+    if img.source == 'FILE' and not img.packed_file and img.filepath:
+        header = read_image_header(bpy.path.abspath(img.filepath, library=img.library))
+        if header is not None:
+            return header
+    return None
+
+# Texture memory model
+## Rough model of what Unity does to a texture on import, since the imported texture is what VRChat actually measures:
+## - Resized so the longest side fits Max Size (2048 by default in Unity). Non power of two sizes get scaled to the nearest power of two.
+## - Compressed to DXT1 without alpha / DXT5 with alpha, DXT5 (DXT5nm) for normal maps and BC6H for HDR. High Quality uses BC7 / BC5 instead, which is the same size per pixel as DXT5.
+## - Full mip chain, which adds roughly a third on top.
+### Crunch compression only shrinks the download - it gets unpacked to DXT1 / DXT5 on the GPU, so it costs the same VRAM as the uncrunched format.
+### Per-image overrides can be set as custom properties on the image: "vrc_max_size" (int) and "vrc_format" (any key of TEXTURE_FORMATS).
+
+TEXTURE_FORMATS = {
+    # format: (block size in pixels, bytes per block)
+    'DXT1': (4, 8),
+    'DXT1_CRUNCHED': (4, 8),
+    'DXT5': (4, 16),
+    'DXT5_CRUNCHED': (4, 16),
+    'BC4': (4, 8),
+    'BC5': (4, 16),
+    'BC6H': (4, 16),
+    'BC7': (4, 16),
+    'R8': (1, 1),
+    'RGB24': (1, 3),
+    'RGBA32': (1, 4),
+    'RGBAHALF': (1, 8),
+}
+
+# DDS files are imported as-is by Unity, so keep whatever they were saved as
+_DDS_FORMATS = {
+    'DXT1': 'DXT1', 'BC1': 'DXT1',
+    'DXT3': 'DXT5', 'BC2': 'DXT5',
+    'DXT5': 'DXT5', 'BC3': 'DXT5',
+    'ATI1': 'BC4', 'BC4': 'BC4',
+    'ATI2': 'BC5', 'BC5': 'BC5',
+    'BC6H': 'BC6H',
+    'BC7': 'BC7',
+    'RGB': 'RGB24',
+    'RGBA': 'RGBA32',
+}
+
+_NORMAL_MAP_HINTS = ("normal", "nrm", "_nor", "_n.", "_n_")
+
+DEFAULT_TEXTURE_SETTINGS = (2048, True, 'NORMAL')
+
+_texture_cost_cache = {}
+
+def get_texture_settings(scene):
+    return (
+        int(scene.vv_tools_vrc_texture_max_size),
+        scene.vv_tools_vrc_texture_mipmaps,
+        scene.vv_tools_vrc_texture_compression,
+    )
+
+def is_normal_map(img):
+    if img.colorspace_settings.name != 'Non-Color':
+        return False
+    name = f"{img.name} {os.path.basename(img.filepath)}".lower()
+    return any(hint in name for hint in _NORMAL_MAP_HINTS)
+
+def infer_texture_format(img, header, compression):
+    if header is not None and header.format.startswith("DDS "):
+        return _DDS_FORMATS.get(header.format[4:], 'RGBA32')
+
+    if header is not None:
+        channels, is_hdr = header.channels, header.format == "EXR"
+    else:
+        channels, is_hdr = img.channels, img.is_float
+
+    has_alpha = channels in (2, 4)
+    if compression == 'NONE':
+        if is_hdr:
+            return 'RGBAHALF'
+        return 'RGBA32' if has_alpha else 'RGB24'
+    if is_hdr:
+        return 'BC6H'
+    if is_normal_map(img):
+        return 'BC5' if compression == 'HIGH' else 'DXT5'
+    if compression == 'HIGH':
+        return 'BC7'
+    return 'DXT5' if has_alpha else 'DXT1'
+
+def _nearest_power_of_two(value):
+    lower = 1 << (max(int(value), 1).bit_length() - 1)
+    upper = lower << 1
+    return lower if value - lower < upper - value else upper
+
+def import_texture_size(width, height, max_size, resize=True):
+    if not resize:
+        return width, height
+    width, height = _nearest_power_of_two(width), _nearest_power_of_two(height)
+    # Halved until it fits, so overrides that aren't powers of two (vrc_max_size = 3000) still end up at or under the limit
+    while max(width, height) > max(max_size, 1):
+        width, height = max(width // 2, 1), max(height // 2, 1)
+    return width, height
+
+def texture_bytes(width, height, texture_format, mipmaps=True):
+    block, block_bytes = TEXTURE_FORMATS[texture_format]
+    total = 0
+    while True:
+        total += -(-width // block) * -(-height // block) * block_bytes
+        if not mipmaps or (width == 1 and height == 1):
+            return total
+        width, height = max(width // 2, 1), max(height // 2, 1)
+
+def _image_source_key(img):
+    if img.source == 'FILE' and not img.packed_file and img.filepath:
+        filepath = bpy.path.abspath(img.filepath, library=img.library)
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return ('MISSING', filepath)
+        return ('FILE', filepath, stat.st_mtime_ns, stat.st_size)
+    if img.packed_file:
+        return ('PACKED', img.name, img.packed_file.size)
+    if img.source == 'GENERATED':
+        return ('GENERATED', img.name, img.generated_width, img.generated_height, img.generated_float)
+    return (img.source, img.name)
+
+# Memoized per image on filepath + mtime (and settings / overrides), so repeated runs don't need to look at the file again.
+def estimate_texture_memory(img, texture_settings=DEFAULT_TEXTURE_SETTINGS):
+    max_size, mipmaps, compression = texture_settings
+    overrides = (img.get("vrc_max_size"), img.get("vrc_format"))
+    key = (_image_source_key(img), texture_settings, overrides)
+    cost = _texture_cost_cache.get(key)
+    if cost is not None:
+        return cost
+
+    header = get_image_header(img)
+    if header is not None:
+        width, height = header.width, header.height
+    else:
+        width, height = img.size[0], img.size[1]
+
+    texture_format = infer_texture_format(img, header, compression)
+    if overrides[1] is not None and str(overrides[1]).upper() in TEXTURE_FORMATS:
+        texture_format = str(overrides[1]).upper()
+    if overrides[0]:
+        max_size = int(overrides[0])
+
+    cost = 0
+    if width and height:
+        is_dds = header is not None and header.format.startswith("DDS ")
+        width, height = import_texture_size(width, height, max_size, resize=not is_dds)
+        cost = texture_bytes(width, height, texture_format, mipmaps)
+
+    _texture_cost_cache[key] = cost
+    return cost
+
+# Per-object analysis. Returns a small dict of plain values for a single object, so results can be summed up afterwards without holding on to any Blender data.
+## The depsgraph is passed in rather than fetched here - evaluated_depsgraph_get() can trigger a full scene evaluation, so we only want to do that once per run.
+
+# The expensive, mesh level part of the analysis. Everything in here only depends on the mesh data and the modifier stack, so linked duplicates can share the result.
+def analyze_mesh_data(obj, depsgraph):
+    mesh_stats = {
+        'triangles': 0,
+        'shape_key_memory': 0,
+        'shape_keys': {},
+        'weighted_group_indices': [],
+        'vertices': 0,
+        'uv_maps': 0,
+        'color_attributes': 0,
+        'vertex_buffer_memory': 0,
+    }
+    skinned = any(mod.type == 'ARMATURE' for mod in obj.modifiers)
+
+    # Read from the evaluated object so things like Subdiv get calcuated properly, since they can and do get exported.
+    # to_mesh() gives us a temporary mesh owned by the evaluated object, so nothing is added to bpy.data - it just needs clearing once we're done.
+    eval_obj = obj.evaluated_get(depsgraph)
+    eval_mesh = eval_obj.to_mesh()
+    try:
+        #Calculate triangle count. We need to calculate *tris* since perf rank is based on these, not the internal Blender polygon calculation
+        if eval_mesh is not None:
+            mesh_stats['triangles'] = count_triangles(eval_mesh)
+            mesh_stats.update(estimate_vertex_buffer(eval_mesh, skinned))
+    finally:
+        eval_obj.to_mesh_clear()
+
+    mesh_stats['shape_key_memory'], mesh_stats['shape_keys'] = estimate_shape_key_memory(obj.data)
+    if any(mod.type == 'ARMATURE' and mod.object for mod in obj.modifiers):
+        mesh_stats['weighted_group_indices'] = get_weighted_group_indices(obj.data, len(obj.vertex_groups))
+
+    return mesh_stats
+
+def analyze_object(obj, depsgraph, mesh_stats=None):
+    entry = {
+        'name': obj.name,
+        'type': obj.type,
+        'triangles': 0,
+        'material_slots': 0,
+        'skinned': False,
+        'images': [],
+        'shape_key_memory': 0,
+        'shape_keys': {},
+        'bones': 0,
+        'armatures': [],
+        'weighted_groups': [],
+        'armature_data': None,
+        'deform_bones': [],
+        'vertices': 0,
+        'uv_maps': 0,
+        'color_attributes': 0,
+        'vertex_buffer_memory': 0,
+    }
+
+    if obj.type == 'MESH':
+        if mesh_stats is None:
+            mesh_stats = analyze_mesh_data(obj, depsgraph)
+
+        entry['triangles'] = mesh_stats['triangles']
+        entry['shape_key_memory'] = mesh_stats['shape_key_memory']
+        entry['shape_keys'] = mesh_stats['shape_keys']
+        for stat in ('vertices', 'uv_maps', 'color_attributes', 'vertex_buffer_memory'):
+            entry[stat] = mesh_stats[stat]
+        entry['material_slots'] = len(obj.material_slots)
+        entry['armatures'] = [mod.object.name for mod in obj.modifiers if mod.type == 'ARMATURE' and mod.object]
+        entry['skinned'] = any(mod.type == 'ARMATURE' for mod in obj.modifiers)
+        entry['weighted_groups'] = [obj.vertex_groups[index].name for index in mesh_stats['weighted_group_indices']]
+
+        # Only image names are kept here - they're priced per run (see price_images), so re-exported textures don't go stale in the object cache.
+        for mat_slot in obj.material_slots:
+            for img in get_material_images(mat_slot.material):
+                if img.name not in entry['images']:
+                    entry['images'].append(img.name)
+
+    elif obj.type == 'ARMATURE':
+        entry['bones'] = len(obj.data.bones)
+        entry['armature_data'] = obj.data.name
+        entry['deform_bones'] = [bone.name for bone in obj.data.bones if bone.use_deform]
+
+    return entry
+
+# Effective bone count
+## Only deforming bones that some analysed mesh actually has weights for make it into Unity's skinned mesh bones - IK targets, control bones and unweighted bones don't count.
+### Armature objects sharing the same armature data are only counted once.
+
+def count_effective_bones(entries):
+    armature_data = {entry['name']: entry['armature_data'] for entry in entries if entry['type'] == 'ARMATURE'}
+
+    weighted_groups = {}
+    for entry in entries:
+        if entry['type'] == 'MESH':
+            for armature_name in entry['armatures']:
+                data_name = armature_data.get(armature_name)
+                if data_name is not None:
+                    weighted_groups.setdefault(data_name, set()).update(entry['weighted_groups'])
+
+    # Keyed by armature object name, later objects sharing data with an earlier one get 0
+    effective_bones = {}
+    counted_data = set()
+    for entry in entries:
+        if entry['type'] == 'ARMATURE':
+            data_name = entry['armature_data']
+            if data_name in counted_data:
+                effective_bones[entry['name']] = 0
+                continue
+            counted_data.add(data_name)
+            used = set(entry['deform_bones']) & weighted_groups.get(data_name, set())
+            effective_bones[entry['name']] = len(used)
+
+    return effective_bones
+
+# Texture memory per image name for a run. estimate_texture_memory is memoized on the file's mtime / size, so this is cheap for unchanged textures.
+def price_images(entries, texture_settings=DEFAULT_TEXTURE_SETTINGS):
+    image_costs = {}
+    for entry in entries:
+        for image_name in entry['images']:
+            if image_name not in image_costs:
+                img = bpy.data.images.get(image_name)
+                image_costs[image_name] = estimate_texture_memory(img, texture_settings) if img else 0
+    return image_costs
+
+def summarize_objects(entries, image_costs):
     statistics = {
         'triangles': 0,
         'texture_memory': 0,
@@ -56,46 +576,612 @@ def analyze_selected_objects():
         'meshes': 0,
         'material_slots': 0,
         'bones': 0,
+        'shape_key_memory': 0,
+        'vertices': 0,
+        'vertex_buffer_memory': 0,
     }
 
     texture_memory_usage = {}
-    
-    # Iterate through selected objects
-    for obj in bpy.context.selected_objects:
-        if obj.type == 'MESH':
-            # Apply modifiers to a temporary mesh. This is so things like Subdiv get calcuated properly, since they can and do get exported. 
-            depsgraph = bpy.context.evaluated_depsgraph_get()
-            temp_obj = obj.evaluated_get(depsgraph)
-            temp_mesh = bpy.data.meshes.new_from_object(temp_obj)
-            
-            #Calculate triangle count. We need to calculate *tris* since perf rank is based on these, not the internal Blender polygon calculation
-            triangles = sum(len(p.vertices) - 2 for p in temp_mesh.polygons)
-            statistics['triangles'] += triangles
-
-            bpy.data.meshes.remove(temp_mesh)
-            statistics['material_slots'] += len(obj.material_slots)
-
-            if any(mod for mod in obj.modifiers if mod.type == 'ARMATURE'):
+    objects = []
+    effective_bones = count_effective_bones(entries)
+    counted_armatures = set()
+    statistics['bones_total'] = 0
+
+    for entry in entries:
+        breakdown = {
+            'name': entry['name'],
+            'type': entry['type'],
+            'triangles': entry['triangles'],
+            'material_slots': entry['material_slots'],
+            'texture_memory': 0,
+            'shape_key_memory': entry['shape_key_memory'],
+            'shape_keys': entry['shape_keys'],
+            'vertices': entry['vertices'],
+            'uv_maps': entry['uv_maps'],
+            'color_attributes': entry['color_attributes'],
+            'vertex_buffer_memory': entry['vertex_buffer_memory'],
+            'bones': effective_bones.get(entry['name'], 0) if entry['type'] == 'ARMATURE' else 0,
+        }
+
+        if entry['type'] == 'MESH':
+            statistics['triangles'] += entry['triangles']
+            statistics['material_slots'] += entry['material_slots']
+            statistics['shape_key_memory'] += entry['shape_key_memory']
+            statistics['vertices'] += entry['vertices']
+            statistics['vertex_buffer_memory'] += entry['vertex_buffer_memory']
+
+            if entry['skinned']:
                 statistics['skinned_meshes'] += 1
             else:
                 statistics['meshes'] += 1
 
-            # Estimate texture memory... I think this is correct and accounts for texture sharing?
-            for mat_slot in obj.material_slots:
-                if mat_slot.material:
-                    for node in mat_slot.material.node_tree.nodes:
-                        if node.type == "TEX_IMAGE":
-                            img = node.image
-                            if img:
-                                if img not in texture_memory_usage:
-                                    texture_memory_usage[img] = img.size[0] * img.size[1] * 4 // 4 # Assuming a DXT5 compression ratio for textures, at their current resolution (not 2k). This should be a little more accurate, I think?
-                                    
-        elif obj.type == 'ARMATURE':
-            statistics['bones'] += len(obj.data.bones)
-    
+            # Shared textures only count once - the first object using an image owns its memory in the breakdown
+            for image_name in entry['images']:
+                image_memory = image_costs.get(image_name, 0)
+                if image_name not in texture_memory_usage:
+                    texture_memory_usage[image_name] = image_memory
+                    breakdown['texture_memory'] += image_memory
+
+        elif entry['type'] == 'ARMATURE':
+            statistics['bones'] += breakdown['bones']
+            if entry['armature_data'] not in counted_armatures:
+                counted_armatures.add(entry['armature_data'])
+                statistics['bones_total'] += entry['bones']
+
+        objects.append(breakdown)
+
     statistics['texture_memory'] = sum(texture_memory_usage.values())
+    statistics['objects'] = objects
     return statistics
 
+# VRC Analysis cache
+## Per-object results are kept between runs, so pressing VRC Analyse again only has to evaluate objects that actually changed.
+### Entries are keyed on object / mesh identity plus a fingerprint of the modifier stack and materials. The depsgraph handler below stamps every ID it sees updated with a serial number - an entry is stale if any ID it depends on was stamped after the entry was made.
+
+_analysis_cache = {}
+_id_update_serials = {}
+_update_serial = 0
+
+# Modifier settings that only affect the UI, so they shouldn't stop linked duplicates from sharing results
+_FINGERPRINT_IGNORED_PROPERTIES = {"rna_type", "name", "is_override_data", "show_expanded", "is_active", "show_in_editmode", "show_on_cage", "persistent_uid"}
+
+def _modifier_fingerprint(obj):
+    fingerprint = []
+    for mod in obj.modifiers:
+        values = [mod.type]
+        for prop in mod.bl_rna.properties:
+            if prop.identifier in _FINGERPRINT_IGNORED_PROPERTIES:
+                continue
+            value = getattr(mod, prop.identifier, None)
+            if prop.type == 'POINTER':
+                value = getattr(value, "name", None)
+            elif prop.type == 'COLLECTION':
+                continue
+            elif getattr(prop, "is_array", False):
+                value = tuple(value)
+            values.append(value)
+        # Geometry Nodes inputs are stored as ID properties on the modifier rather than RNA properties
+        if mod.type == 'NODES':
+            values.append(tuple((name, repr(value)) for name, value in mod.items()))
+        fingerprint.append(tuple(values))
+    return tuple(fingerprint)
+
+def _material_fingerprint(obj):
+    return tuple(slot.material.name if slot.material else None for slot in obj.material_slots)
+
+def _object_cache_key(obj, modifier_fingerprint):
+    data_pointer = obj.data.as_pointer() if obj.data else 0
+    data_name = obj.data.name if obj.data else None
+    return (obj.name, data_name, data_pointer, modifier_fingerprint, _material_fingerprint(obj))
+
+def _object_dependencies(obj, entry):
+    dependencies = {obj.as_pointer()}
+    if obj.data:
+        dependencies.add(obj.data.as_pointer())
+    for slot in obj.material_slots:
+        if slot.material:
+            dependencies.add(slot.material.as_pointer())
+    for mod in obj.modifiers:
+        for prop in mod.bl_rna.properties:
+            if prop.type == 'POINTER':
+                value = getattr(mod, prop.identifier, None)
+                if isinstance(value, bpy.types.ID):
+                    dependencies.add(value.as_pointer())
+    for image_name in entry['images']:
+        img = bpy.data.images.get(image_name)
+        if img:
+            dependencies.add(img.as_pointer())
+    return tuple(dependencies)
+
+def _cached_entry(obj, key):
+    cached = _analysis_cache.get(obj.as_pointer())
+    if cached is None or cached['key'] != key:
+        return None
+    for pointer in cached['dependencies']:
+        if _id_update_serials.get(pointer, 0) > cached['serial']:
+            return None
+    return cached['entry']
+
+def invalidate_analysis_cache():
+    _analysis_cache.clear()
+    _texture_cost_cache.clear()
+    _id_update_serials.clear()
+
+@persistent
+def vrc_analysis_depsgraph_update(scene, depsgraph):
+    global _update_serial
+    _update_serial += 1
+    for update in depsgraph.updates:
+        # Moving an object around doesn't change any of its stats, so only geometry / shading updates count for objects.
+        if isinstance(update.id, bpy.types.Object) and not (update.is_updated_geometry or update.is_updated_shading):
+            continue
+        _id_update_serials[update.id.original.as_pointer()] = _update_serial
+
+    if getattr(scene, "vv_tools_vrc_live", False):
+        schedule_live_analysis(scene)
+
+# Undo and file loads swap out every datablock, so pointers from before are meaningless.
+@persistent
+def vrc_analysis_reset_cache(*args):
+    invalidate_analysis_cache()
+    _published_results.clear()
+    _history_cache.clear()
+    _active_profiles.clear()
+
+# A single analysis run, one object per step. The synchronous path just steps through everything at once, the modal operator steps under a time budget - both end up with the exact same entries.
+class AnalysisRun:
+    def __init__(self, objects, depsgraph=None, use_cache=True, texture_settings=None, avatars=None):
+        if texture_settings is None:
+            texture_settings = get_texture_settings(bpy.context.scene)
+        self.objects = list(objects)
+        # {avatar name: [object names]}, adds a summary per avatar to the results
+        self.avatars = avatars
+        self.depsgraph = depsgraph
+        self.use_cache = use_cache
+        self.texture_settings = texture_settings
+        self.entries = []
+        self.index = 0
+        # Linked duplicates (same mesh data, same modifier stack) only get evaluated once per run, the rest reuse the mesh level stats
+        self.shared_mesh_stats = {}
+        # Timing is kept out of the results, they'd never compare equal between runs otherwise
+        self.seconds = 0.0
+        self.evaluated = 0
+        self.cached = 0
+
+    @property
+    def total(self):
+        return len(self.objects)
+
+    @property
+    def finished(self):
+        return self.index >= len(self.objects)
+
+    def step(self):
+        if self.finished:
+            return False
+        # Fetching the depsgraph is what flushes pending edits and fires the update handler that invalidates the cache,
+        # so it has to happen before any cache lookup - otherwise a script editing a mesh and analysing straight away gets the old entry.
+        # Cheap when nothing is tagged.
+        if self.depsgraph is None:
+            self.depsgraph = bpy.context.evaluated_depsgraph_get()
+        obj = self.objects[self.index]
+        self.index += 1
+        start = time.perf_counter()
+        try:
+            self.entries.append(self._analyze(obj))
+        except ReferenceError:
+            # Object got deleted while a modal run was in progress
+            pass
+        self.seconds += time.perf_counter() - start
+        return not self.finished
+
+    def _analyze(self, obj):
+        modifier_fingerprint = _modifier_fingerprint(obj)
+        key = _object_cache_key(obj, modifier_fingerprint)
+        entry = _cached_entry(obj, key) if self.use_cache else None
+        if entry is not None:
+            self.cached += 1
+            return entry
+        self.evaluated += 1
+
+        mesh_stats = None
+        if obj.type == 'MESH':
+            mesh_key = (obj.data.as_pointer(), len(obj.vertex_groups), modifier_fingerprint)
+            mesh_stats = self.shared_mesh_stats.get(mesh_key)
+            if mesh_stats is None:
+                mesh_stats = analyze_mesh_data(obj, self.depsgraph)
+                self.shared_mesh_stats[mesh_key] = mesh_stats
+        entry = analyze_object(obj, self.depsgraph, mesh_stats)
+        _analysis_cache[obj.as_pointer()] = {
+            'key': key,
+            'serial': _update_serial,
+            'dependencies': _object_dependencies(obj, entry),
+            'entry': entry,
+        }
+        return entry
+
+    def results(self):
+        image_costs = price_images(self.entries, self.texture_settings)
+        results = summarize_objects(self.entries, image_costs)
+        if self.avatars is not None:
+            results['avatars'] = summarize_avatars(self.entries, self.avatars, image_costs)
+        if not self.finished:
+            results['partial'] = {'analysed': self.index, 'total': self.total}
+        return results
+
+    def timing(self):
+        return {'seconds': self.seconds, 'objects': self.index, 'evaluated': self.evaluated, 'cached': self.cached}
+
+def analyze_objects(objects, depsgraph=None, use_cache=True, texture_settings=None, avatars=None):
+    run = AnalysisRun(objects, depsgraph, use_cache, texture_settings, avatars)
+    while run.step():
+        pass
+    return run.results()
+
+def analyze_selected_objects():
+    return analyze_objects(bpy.context.selected_objects)
+
+# Analysis reports
+## A complete report for upload pipelines - totals, rank and warnings for every profile, the per-object breakdown, per-avatar summaries and timing.
+## Goes through the usual analysis cache, so exporting right after an analysis doesn't evaluate anything again. Works from background scripts too:
+###     vrcanalysisops.export_analysis_report("report.vvrc", objects, texture_settings=vrcanalysisops.DEFAULT_TEXTURE_SETTINGS)
+### The file formats live in vrcreport.py.
+
+_REPORT_EXCLUDED_RESULTS = {'objects', 'avatars', 'partial'}
+
+def build_analysis_report(results, profiles=None, timing=None):
+    profiles = profiles or get_rank_profiles()
+    return {
+        'version': REPORT_VERSION,
+        'file': bpy.data.filepath,
+        'generated': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'statistics': {stat: value for stat, value in results.items() if stat not in _REPORT_EXCLUDED_RESULTS},
+        'ranks': {profile_id: performance_rank(results, profile_id, profiles) for profile_id in profiles},
+        'warnings': {profile_id: performance_warning(results, profile_id, profiles) for profile_id in profiles},
+        'objects': results.get('objects', []),
+        'avatars': {
+            avatar_name: {
+                'statistics': statistics,
+                'ranks': {profile_id: performance_rank(statistics, profile_id, profiles) for profile_id in profiles},
+            }
+            for avatar_name, statistics in results.get('avatars', {}).items()
+        },
+        'timing': timing or {},
+    }
+
+def export_analysis_report(filepath, objects, report_format=None, profiles=None, texture_settings=None, avatars=None):
+    run = AnalysisRun(objects, texture_settings=texture_settings, avatars=avatars)
+    while run.step():
+        pass
+    report = build_analysis_report(run.results(), profiles, run.timing())
+    write_report(report, filepath, report_format)
+    return report
+
+# Selection lookup that also works from timers, where context.selected_objects isn't available.
+def get_selected_objects(context):
+    view_layer = context.view_layer
+    return [obj for obj in view_layer.objects if obj.select_get(view_layer=view_layer)]
+
+# Analysis scopes
+## What gets analysed - the selection, a collection, one avatar (an armature and everything that belongs to it), or every avatar in the scene at once.
+### Avatar membership comes from an index built in one pass over the scene, instead of asking find_armature() for every object again for each armature.
+### An avatar is a top level armature. Meshes belong to the armature their Armature modifier points at, or else the armature they're parented under. Armatures parented to another armature (outfit rigs etc.) belong to that avatar.
+
+ANALYSED_TYPES = {'MESH', 'ARMATURE'}
+
+def build_armature_index(objects):
+    roots = {}
+
+    def avatar_root(obj):
+        root = roots.get(obj.name)
+        if root is None:
+            root = obj
+            parent = obj.parent
+            while parent is not None:
+                if parent.type == 'ARMATURE':
+                    root = parent
+                parent = parent.parent
+            roots[obj.name] = root
+        return root
+
+    index = {}
+    for obj in objects:
+        armature = None
+        if obj.type == 'ARMATURE':
+            armature = obj
+        elif obj.type == 'MESH':
+            armature = next((mod.object for mod in obj.modifiers if mod.type == 'ARMATURE' and mod.object), None)
+            parent = obj.parent
+            while armature is None and parent is not None:
+                if parent.type == 'ARMATURE':
+                    armature = parent
+                parent = parent.parent
+        if armature is not None:
+            index.setdefault(avatar_root(armature).name, []).append(obj)
+    return index
+
+def summarize_avatars(entries, avatars, image_costs):
+    entries_by_name = {entry['name']: entry for entry in entries}
+    summaries = {}
+    for avatar_name, object_names in avatars.items():
+        summary = summarize_objects([entries_by_name[name] for name in object_names if name in entries_by_name], image_costs)
+        del summary['objects']
+        summaries[avatar_name] = summary
+    return summaries
+
+# Returns (objects, avatars) - avatars is {avatar name: [object names]} for the All Avatars scope, None otherwise
+def get_scope_objects(context, scope=None):
+    scene = context.scene
+    scope = scope or scene.vv_tools_vrc_scope
+    if scope == 'SELECTED':
+        return get_selected_objects(context), None
+
+    scene_objects = [obj for obj in context.view_layer.objects if obj.type in ANALYSED_TYPES]
+    if scope == 'COLLECTION':
+        collection = scene.vv_tools_vrc_scope_collection
+        if collection is None:
+            return [], None
+        members = set(collection.all_objects)
+        return [obj for obj in scene_objects if obj in members], None
+
+    index = build_armature_index(scene_objects)
+    if scope == 'ARMATURE':
+        armature = scene.vv_tools_vrc_scope_armature
+        if armature is None:
+            return [], None
+        for objects in index.values():
+            if armature in objects:
+                return objects, None
+        return [armature], None
+
+    # AVATARS - one run over everything, summaries split per avatar afterwards
+    objects = [obj for avatar_objects in index.values() for obj in avatar_objects]
+    return objects, {avatar_name: [obj.name for obj in avatar_objects] for avatar_name, avatar_objects in index.items()}
+
+def analyze_scope(context, scope=None):
+    objects, avatars = get_scope_objects(context, scope)
+    return analyze_objects(objects, avatars=avatars)
+
+# Published results
+## Results are stored in the scene as a JSON string (so they survive save / load), alongside a revision counter that is bumped on every write.
+### The panel redraws constantly while orbiting the viewport, so the parsed results, rank and warnings are kept here keyed on (scene, revision) and only rebuilt when the revision moves.
+
+_published_results = {}
+
+def _build_display(results):
+    return {
+        'results': results,
+        'profiles': None,
+        'rankings': {},
+        'top_objects': {},
+        'avatar_ranks': {},
+    }
+
+# Rank and warning lines for one profile, computed once per analysis / profile set and kept on the display.
+def get_profile_ranking(display, profiles, profile_id):
+    if display['profiles'] is not profiles:
+        display['profiles'] = profiles
+        display['rankings'] = {}
+        display['avatar_ranks'] = {}
+
+    ranking = display['rankings'].get(profile_id)
+    if ranking is None:
+        results = display['results']
+        warnings = []
+        for warning in performance_warning(results, profile_id, profiles):
+            lines = re.split(r'(?<=[.!,] )', warning)  # Split the text at both '. ' and ', '. This is a bit of a hack - maybe I should shorten warnings...
+            warnings.append([line for line in lines if line])
+        ranking = {
+            'rank': performance_rank(results, profile_id, profiles),
+            'warnings': warnings,
+        }
+        display['rankings'][profile_id] = ranking
+    return ranking
+
+# Rank of every avatar in an All Avatars analysis for one profile, kept on the display like the rankings above.
+def get_avatar_ranks(display, profiles, profile_id):
+    get_profile_ranking(display, profiles, profile_id)
+    ranks = display['avatar_ranks'].get(profile_id)
+    if ranks is None:
+        avatars = display['results'].get('avatars', {})
+        ranks = {avatar_name: performance_rank(statistics, profile_id, profiles) for avatar_name, statistics in avatars.items()}
+        display['avatar_ranks'][profile_id] = ranks
+    return ranks
+
+def get_selected_profiles(scene, profiles):
+    selected = [profile_id for profile_id in profiles if profile_id in scene.vv_tools_vrc_profiles]
+    return selected or [DEFAULT_PROFILE]
+
+_profile_enum_items = []
+
+def profile_enum_items(self, context):
+    # Blender needs the item list kept alive on the Python side for dynamic enums
+    profiles = get_active_rank_profiles(context.scene) if context else get_rank_profiles()
+    _profile_enum_items[:] = [(profile_id, profile['label'], profile['description'], 1 << i) for i, (profile_id, profile) in enumerate(profiles.items())]
+    return _profile_enum_items
+
+# Per-object breakdown sorted by one statistic. Sorted lists are kept on the display, so this only sorts once per analysis and key.
+def get_top_objects(display, key, count):
+    top_objects = display['top_objects'].get(key)
+    if top_objects is None:
+        objects = display['results'].get('objects', [])
+        top_objects = sorted((obj for obj in objects if obj.get(key)), key=lambda obj: obj[key], reverse=True)
+        display['top_objects'][key] = top_objects
+    return top_objects[:count]
+
+# Writes results into the scene. Returns False if nothing changed, so callers can skip redraws.
+def publish_analysis_results(scene, results):
+    results_str = json.dumps(results)
+    if scene.get("VRC_Analysis_Results") == results_str:
+        return False
+    revision = scene.get("VRC_Analysis_Revision", 0) + 1
+    scene["VRC_Analysis_Results"] = results_str
+    scene["VRC_Analysis_Revision"] = revision
+    # Good moment to pick up edits to the profile files, the panel is about to redraw anyway
+    resolve_rank_profiles(scene)
+    _published_results.clear()
+    _published_results[(scene.as_pointer(), revision)] = _build_display(results)
+    return True
+
+# Cheap lookup for draw code. Only parses the stored JSON the first time a scene / revision is seen (eg. after opening a file).
+def get_analysis_display(scene):
+    if "VRC_Analysis_Results" not in scene:
+        return None
+    key = (scene.as_pointer(), scene.get("VRC_Analysis_Revision", 0))
+    display = _published_results.get(key)
+    if display is None:
+        display = _build_display(json.loads(scene["VRC_Analysis_Results"]))
+        _published_results.clear()
+        _published_results[key] = display
+    return display
+
+def tag_analysis_panels_redraw():
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                for region in area.regions:
+                    if region.type == 'UI':
+                        region.tag_redraw()
+
+# Analysis snapshots
+## Every VRC Analyse run keeps a compact snapshot (totals + a few numbers per object) in a bounded history on the scene, oldest ones get dropped once it's full.
+## A snapshot can be pinned as the baseline, and the panel shows deltas against it - "how many tris did that decimate save?".
+### Diffs only compare stored snapshots, so nothing gets re-evaluated. Live analysis doesn't add to the history, it'd just fill it up with noise.
+
+SNAPSHOT_TOTALS = ('triangles', 'texture_memory', 'shape_key_memory', 'vertices', 'vertex_buffer_memory', 'skinned_meshes', 'meshes', 'material_slots', 'bones')
+SNAPSHOT_FIELDS = ('triangles', 'texture_memory', 'shape_key_memory', 'material_slots', 'bones')
+
+_history_cache = {}
+
+def make_snapshot(results, snapshot_id):
+    return {
+        'id': snapshot_id,
+        'time': time.strftime("%H:%M:%S"),
+        'totals': {stat: results.get(stat, 0) for stat in SNAPSHOT_TOTALS},
+        'objects': {obj['name']: [obj.get(field, 0) for field in SNAPSHOT_FIELDS] for obj in results.get('objects', [])},
+    }
+
+def _write_history(scene, history=None, baseline=None):
+    if history is not None:
+        scene["VRC_Analysis_History"] = json.dumps(history)
+    if baseline is not None:
+        scene["VRC_Analysis_Baseline"] = json.dumps(baseline)
+    scene["VRC_Analysis_History_Revision"] = scene.get("VRC_Analysis_History_Revision", 0) + 1
+
+# Parsed history / baseline, cached on (scene, revision) like the published results
+def get_analysis_history(scene):
+    key = (scene.as_pointer(), scene.get("VRC_Analysis_History_Revision", 0))
+    cached = _history_cache.get(key)
+    if cached is None:
+        cached = {
+            'history': json.loads(scene.get("VRC_Analysis_History", "[]")),
+            'baseline': json.loads(scene["VRC_Analysis_Baseline"]) if scene.get("VRC_Analysis_Baseline") else None,
+        }
+        _history_cache.clear()
+        _history_cache[key] = cached
+    return cached
+
+def record_snapshot(scene, results, history_size=10):
+    if 'partial' in results:
+        return None
+    history = list(get_analysis_history(scene)['history'])
+    snapshot_id = scene.get("VRC_Analysis_Snapshot_Counter", 0) + 1
+    snapshot = make_snapshot(results, snapshot_id)
+
+    # Re-running without changing anything doesn't need another entry
+    if history and history[-1]['totals'] == snapshot['totals'] and history[-1]['objects'] == snapshot['objects']:
+        return history[-1]
+
+    scene["VRC_Analysis_Snapshot_Counter"] = snapshot_id
+    history.append(snapshot)
+    del history[:max(len(history) - history_size, 0)]
+    _write_history(scene, history=history)
+    return snapshot
+
+def pin_baseline(scene, snapshot_id=None):
+    history = get_analysis_history(scene)['history']
+    if not history:
+        return None
+    snapshot = history[-1] if snapshot_id is None else next((s for s in history if s['id'] == snapshot_id), None)
+    if snapshot is not None:
+        _write_history(scene, baseline=snapshot)
+    return snapshot
+
+def clear_baseline(scene):
+    if "VRC_Analysis_Baseline" in scene:
+        del scene["VRC_Analysis_Baseline"]
+    _write_history(scene)
+
+def clear_history(scene):
+    _write_history(scene, history=[])
+
+def diff_snapshots(baseline, current):
+    totals = {stat: current['totals'].get(stat, 0) - baseline['totals'].get(stat, 0) for stat in SNAPSHOT_TOTALS}
+
+    empty = [0] * len(SNAPSHOT_FIELDS)
+    objects = []
+    for name in current['objects'].keys() | baseline['objects'].keys():
+        before = baseline['objects'].get(name)
+        after = current['objects'].get(name)
+        if before == after:
+            continue
+        delta = {field: a - b for field, a, b in zip(SNAPSHOT_FIELDS, after or empty, before or empty)}
+        status = 'added' if before is None else 'removed' if after is None else 'changed'
+        objects.append({'name': name, 'status': status, **delta})
+
+    objects.sort(key=lambda obj: (abs(obj['triangles']), abs(obj['texture_memory'])), reverse=True)
+    return {'baseline': baseline, 'totals': totals, 'objects': objects}
+
+# Diff of the published results against the pinned baseline, kept on the display per baseline
+def get_baseline_diff(display, scene):
+    baseline = get_analysis_history(scene)['baseline']
+    if baseline is None or 'partial' in display['results']:
+        return None
+    diffs = display.setdefault('diffs', {})
+    diff = diffs.get(baseline['id'])
+    if diff is None:
+        diff = diff_snapshots(baseline, make_snapshot(display['results'], None))
+        diffs[baseline['id']] = diff
+    return diff
+
+# Live VRC Analysis
+## Opt-in mode that re-runs the analysis when the scene changes, so the panel doesn't sit on stale numbers.
+### Depsgraph updates only register a timer - bursts of edits (dragging, sculpting etc) get coalesced into one run per interval, and the run itself goes through the cache so only dirty objects get evaluated.
+
+_last_live_run = 0.0
+
+def schedule_live_analysis(scene):
+    if bpy.app.timers.is_registered(vrc_live_analysis_tick):
+        return
+    elapsed = time.monotonic() - _last_live_run
+    delay = max(scene.vv_tools_vrc_live_interval - elapsed, 0.0)
+    bpy.app.timers.register(vrc_live_analysis_tick, first_interval=delay)
+
+def vrc_live_analysis_tick():
+    global _last_live_run
+    _last_live_run = time.monotonic()
+
+    context = bpy.context
+    scene = context.scene
+    if scene is None or not scene.vv_tools_vrc_live:
+        return None
+
+    try:
+        results = analyze_scope(context)
+    except Exception as e:
+        print(f"VV Tools: live VRC analysis failed: {e}")
+        return None
+
+    if publish_analysis_results(scene, results):
+        tag_analysis_panels_redraw()
+    return None
+
+def update_vrc_live(self, context):
+    if self.vv_tools_vrc_live:
+        schedule_live_analysis(self)
+    elif bpy.app.timers.is_registered(vrc_live_analysis_tick):
+        bpy.app.timers.unregister(vrc_live_analysis_tick)
+
 class VVTools_OT_VRCAnalyse(Operator):
     bl_idname = "vv_tools.vrc_analyse"
     bl_label = "VRC Analyse"
@@ -103,23 +1189,324 @@ class VVTools_OT_VRCAnalyse(Operator):
 
     def execute(self, context):
         context.area.tag_redraw()
-        result = analyze_selected_objects()
-        context.scene["VRC_Analysis_Results"] = json.dumps(result)
+        result = analyze_scope(context)
+        publish_analysis_results(context.scene, result)
+        record_snapshot(context.scene, result, context.scene.vv_tools_vrc_history_size)
 
         # Redraw the area to update the panel. Without this, user input is required to make the panel update. 
         context.area.tag_redraw()
 
         return {"FINISHED"}
 
+# Modal VRC Analyse
+## Same analysis, but run in small time-sliced chunks from a timer so Blender stays responsive on big scenes. Shows progress, publishes partial results as it goes and can be cancelled with Esc.
+
+class VVTools_OT_VRCAnalyseModal(Operator):
+    bl_idname = "vv_tools.vrc_analyse_modal"
+    bl_label = "VRC Analyse (Background)"
+    bl_description = "Analyse the objects in the analysis scope in small steps with progress, without freezing Blender. Press Esc to cancel"
+    bl_options = {"REGISTER", "UNDO", "INTERNAL"}
+
+    time_budget: bpy.props.FloatProperty(
+        name="Time Budget",
+        description="Time in seconds spent analysing per step before handing control back to Blender",
+        default=0.05,
+        min=0.005,
+        soft_max=0.5,
+        subtype='TIME',
+        unit='TIME',
+    )
+
+    _run = None
+    _timer = None
+
+    def start_run(self, context):
+        objects, avatars = get_scope_objects(context)
+        self._run = AnalysisRun(objects, avatars=avatars)
+
+    def publish(self, context):
+        results = self._run.results()
+        publish_analysis_results(context.scene, results)
+        if self._run.finished:
+            record_snapshot(context.scene, results, context.scene.vv_tools_vrc_history_size)
+        tag_analysis_panels_redraw()
+
+    # Called from scripts (EXEC_DEFAULT) - the same run, just stepped through in one go
+    def execute(self, context):
+        self.start_run(context)
+        while self._run.step():
+            pass
+        self.publish(context)
+        return {"FINISHED"}
+
+    def invoke(self, context, event):
+        self.start_run(context)
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.01, window=context.window)
+        wm.progress_begin(0, max(self._run.total, 1))
+        wm.modal_handler_add(self)
+        return {"RUNNING_MODAL"}
+
+    def finish(self, context):
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        tag_analysis_panels_redraw()
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.finish(context)
+            self.report({"INFO"}, f"VRC Analysis cancelled after {self._run.index}/{self._run.total} objects")
+            return {"CANCELLED"}
+
+        if event.type != 'TIMER':
+            return {"PASS_THROUGH"}
+
+        deadline = time.monotonic() + self.time_budget
+        while self._run.step() and time.monotonic() < deadline:
+            pass
+
+        context.window_manager.progress_update(self._run.index)
+        self.publish(context)
+
+        if self._run.finished:
+            self.finish(context)
+            return {"FINISHED"}
+        return {"RUNNING_MODAL"}
+
+
+class VVTools_OT_VRCPinBaseline(Operator):
+    bl_idname = "vv_tools.vrc_pin_baseline"
+    bl_label = "Pin Baseline"
+    bl_description = "Pin an analysis snapshot as the baseline to compare new results against"
+    bl_options = {"REGISTER", "UNDO", "INTERNAL"}
+
+    snapshot_id: bpy.props.IntProperty(
+        name="Snapshot",
+        description="Snapshot to pin, -1 pins the latest",
+        default=-1,
+    )
+
+    def execute(self, context):
+        snapshot = pin_baseline(context.scene, None if self.snapshot_id < 0 else self.snapshot_id)
+        if snapshot is None:
+            self.report({"ERROR"}, "No analysis snapshot to pin, run VRC Analyse first")
+            return {"CANCELLED"}
+        tag_analysis_panels_redraw()
+        return {"FINISHED"}
+
+
+class VVTools_OT_VRCClearBaseline(Operator):
+    bl_idname = "vv_tools.vrc_clear_baseline"
+    bl_label = "Clear Baseline"
+    bl_description = "Stop comparing analysis results against the pinned baseline"
+    bl_options = {"REGISTER", "UNDO", "INTERNAL"}
+
+    def execute(self, context):
+        clear_baseline(context.scene)
+        tag_analysis_panels_redraw()
+        return {"FINISHED"}
+
+
+class VVTools_OT_VRCClearHistory(Operator):
+    bl_idname = "vv_tools.vrc_clear_history"
+    bl_label = "Clear History"
+    bl_description = "Remove all stored analysis snapshots (the pinned baseline is kept)"
+    bl_options = {"REGISTER", "UNDO", "INTERNAL"}
+
+    def execute(self, context):
+        clear_history(context.scene)
+        tag_analysis_panels_redraw()
+        return {"FINISHED"}
+
+
+class VVTools_OT_VRCExportReport(Operator):
+    bl_idname = "vv_tools.vrc_export_report"
+    bl_label = "Export VRC Report"
+    bl_description = "Analyse the objects in the analysis scope and write a full report (stats per object, ranks, warnings, timing) to a file"
+    bl_options = {"REGISTER", "INTERNAL"}
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+    report_format: bpy.props.EnumProperty(
+        name="Format",
+        items=[
+            ("json", "JSON", "Full report as JSON"),
+            ("csv", "CSV", "One row per object, plus rows for the totals and each avatar"),
+            ("binary", "Binary", "Compact binary report (.vvrc), readable with vrcreport.read_report"),
+        ],
+        default="json",
+    )
+
+    _extensions = {"json": ".json", "csv": ".csv", "binary": ".vvrc"}
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            blend_name = os.path.splitext(bpy.path.basename(bpy.data.filepath))[0] or "untitled"
+            self.filepath = blend_name + "_vrc_report" + self._extensions[self.report_format]
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+    def check(self, context):
+        # Keep the extension in line with the chosen format
+        filepath = os.path.splitext(self.filepath)[0] + self._extensions[self.report_format]
+        if filepath != self.filepath:
+            self.filepath = filepath
+            return True
+        return False
+
+    def execute(self, context):
+        objects, avatars = get_scope_objects(context)
+        profiles = get_rank_profiles(context.scene.vv_tools_vrc_custom_profiles)
+        try:
+            report = export_analysis_report(bpy.path.abspath(self.filepath), objects, self.report_format, profiles, avatars=avatars)
+        except OSError as e:
+            self.report({"ERROR"}, f"Couldn't write report: {e}")
+            return {"CANCELLED"}
+        timing = report['timing']
+        self.report({"INFO"}, f"VRC report written ({timing['objects']} objects, {timing['evaluated']} evaluated, {timing['seconds']:.2f}s)")
+        return {"FINISHED"}
+
 
 classes = [
     VVTools_OT_VRCAnalyse,
+    VVTools_OT_VRCAnalyseModal,
+    VVTools_OT_VRCPinBaseline,
+    VVTools_OT_VRCClearBaseline,
+    VVTools_OT_VRCClearHistory,
+    VVTools_OT_VRCExportReport,
+]
+
+handlers = [
+    (bpy.app.handlers.depsgraph_update_post, vrc_analysis_depsgraph_update),
+    (bpy.app.handlers.load_post, vrc_analysis_reset_cache),
+    (bpy.app.handlers.undo_post, vrc_analysis_reset_cache),
+    (bpy.app.handlers.redo_post, vrc_analysis_reset_cache),
 ]
 
 def register():
     for cls in classes:
         bpy.utils.register_class(cls)
+    bpy.types.Scene.vv_tools_vrc_live = bpy.props.BoolProperty(
+        name="Live Analysis",
+        description="Re-run VRC analysis of the selected objects automatically when the scene changes",
+        default=False,
+        update=update_vrc_live,
+    )
+    bpy.types.Scene.vv_tools_vrc_live_interval = bpy.props.FloatProperty(
+        name="Interval",
+        description="Minimum time in seconds between live analysis runs",
+        default=0.5,
+        min=0.1,
+        soft_max=5.0,
+        subtype='TIME',
+        unit='TIME',
+    )
+    bpy.types.Scene.vv_tools_vrc_texture_max_size = bpy.props.EnumProperty(
+        name="Max Size",
+        description="Unity texture import Max Size. Textures larger than this are scaled down on import",
+        items=[(str(size), str(size), "") for size in (256, 512, 1024, 2048, 4096, 8192)],
+        default='2048',
+    )
+    bpy.types.Scene.vv_tools_vrc_texture_mipmaps = bpy.props.BoolProperty(
+        name="Mip Maps",
+        description="Include the mip chain in texture memory (Unity generates mip maps by default)",
+        default=True,
+    )
+    bpy.types.Scene.vv_tools_vrc_texture_compression = bpy.props.EnumProperty(
+        name="Compression",
+        description="Unity texture import compression",
+        items=[
+            ("NORMAL", "Normal Quality", "DXT1 / DXT5 depending on alpha, DXT5 for normal maps"),
+            ("HIGH", "High Quality", "BC7, BC5 for normal maps"),
+            ("NONE", "None", "Uncompressed RGB24 / RGBA32"),
+        ],
+        default="NORMAL",
+    )
+    bpy.types.Scene.vv_tools_vrc_top_sort = bpy.props.EnumProperty(
+        name="Sort By",
+        description="Statistic used to sort the per-object breakdown",
+        items=[
+            ("triangles", "Triangles", "Sort by triangle count"),
+            ("texture_memory", "Texture Memory", "Sort by texture memory (shared images count towards the first object using them)"),
+            ("shape_key_memory", "Blendshape Memory", "Sort by estimated shape key memory"),
+            ("vertex_buffer_memory", "Vertex Buffers", "Sort by estimated vertex buffer memory"),
+            ("vertices", "Vertices", "Sort by vertex count after UV seam / sharp edge splits"),
+            ("material_slots", "Material Slots", "Sort by material slot count"),
+            ("bones", "Bones", "Sort by bone count"),
+        ],
+        default="triangles",
+    )
+    bpy.types.Scene.vv_tools_vrc_top_count = bpy.props.IntProperty(
+        name="Top",
+        description="Number of objects shown in the per-object breakdown",
+        default=5,
+        min=0,
+        soft_max=20,
+    )
+    bpy.types.Scene.vv_tools_vrc_profiles = bpy.props.EnumProperty(
+        name="Profiles",
+        description="Performance rank profiles to evaluate. The first one selected is used for warnings",
+        items=profile_enum_items,
+        options={'ENUM_FLAG'},
+    )
+    bpy.types.Scene.vv_tools_vrc_custom_profiles = bpy.props.StringProperty(
+        name="Custom Profiles",
+        description="JSON file with extra performance rank profiles (same format as rank_profiles.json)",
+        subtype='FILE_PATH',
+        update=update_custom_profiles,
+    )
+    bpy.types.Scene.vv_tools_vrc_scope = bpy.props.EnumProperty(
+        name="Scope",
+        description="Objects included in the VRC analysis",
+        items=[
+            ("SELECTED", "Selected", "Analyse the selected objects"),
+            ("COLLECTION", "Collection", "Analyse every mesh and armature in a collection, including child collections"),
+            ("ARMATURE", "Avatar", "Analyse an armature and every object that belongs to it"),
+            ("AVATARS", "All Avatars", "Analyse every avatar in the scene in one go, with a summary per avatar"),
+        ],
+        default="SELECTED",
+    )
+    bpy.types.Scene.vv_tools_vrc_scope_collection = bpy.props.PointerProperty(
+        name="Collection",
+        description="Collection analysed by the Collection scope",
+        type=bpy.types.Collection,
+    )
+    bpy.types.Scene.vv_tools_vrc_scope_armature = bpy.props.PointerProperty(
+        name="Armature",
+        description="Armature analysed by the Avatar scope, together with its meshes",
+        type=bpy.types.Object,
+        poll=lambda self, obj: obj.type == 'ARMATURE',
+    )
+    bpy.types.Scene.vv_tools_vrc_history_size = bpy.props.IntProperty(
+        name="History Size",
+        description="Number of analysis snapshots kept in the history",
+        default=10,
+        min=1,
+        soft_max=50,
+    )
+    for handler_list, handler in handlers:
+        if handler not in handler_list:
+            handler_list.append(handler)
 
 def unregister():
+    for handler_list, handler in reversed(handlers):
+        if handler in handler_list:
+            handler_list.remove(handler)
+    if bpy.app.timers.is_registered(vrc_live_analysis_tick):
+        bpy.app.timers.unregister(vrc_live_analysis_tick)
+    invalidate_analysis_cache()
+    del bpy.types.Scene.vv_tools_vrc_history_size
+    del bpy.types.Scene.vv_tools_vrc_scope_armature
+    del bpy.types.Scene.vv_tools_vrc_scope_collection
+    del bpy.types.Scene.vv_tools_vrc_scope
+    del bpy.types.Scene.vv_tools_vrc_custom_profiles
+    del bpy.types.Scene.vv_tools_vrc_profiles
+    del bpy.types.Scene.vv_tools_vrc_top_count
+    del bpy.types.Scene.vv_tools_vrc_top_sort
+    del bpy.types.Scene.vv_tools_vrc_texture_compression
+    del bpy.types.Scene.vv_tools_vrc_texture_mipmaps
+    del bpy.types.Scene.vv_tools_vrc_texture_max_size
+    del bpy.types.Scene.vv_tools_vrc_live_interval
+    del bpy.types.Scene.vv_tools_vrc_live
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
\ No newline at end of file
@@ -14,6 +14,15 @@ class VVTools_PT_Materials(Panel):
         layout = self.layout
         layout.operator("vv_tools.reload_textures_of_selected")
         layout.operator("vv_tools.remove_unused_materials")
+        layout.operator("vv_tools.merge_duplicate_materials")
+        layout.operator("vv_tools.build_texture_atlas")
+
+        row = layout.row(align=True)
+        row.prop(context.scene, "vv_tools_texture_watch")
+        sub = row.row(align=True)
+        sub.active = context.scene.vv_tools_texture_watch
+        sub.prop(context.scene, "vv_tools_texture_watch_interval", text="")
+        sub.prop(context.scene, "vv_tools_texture_watch_batch", text="")
 
 classes = [
     VVTools_PT_Materials,
@@ -1,11 +1,16 @@
 # panels/vrcanalysispanel.py
 
 import bpy
-import json
-import re
-from ..operators.vrcanalysisops import performance_rank, performance_warning, analyze_selected_objects
+from ..operators.vrcanalysisops import get_analysis_display, get_top_objects, get_active_rank_profiles, get_profile_ranking, get_selected_profiles, get_analysis_history, get_baseline_diff, get_avatar_ranks
 from bpy.types import Panel
 
+MEMORY_STATS = {'texture_memory', 'shape_key_memory', 'vertex_buffer_memory'}
+
+def format_delta(stat, value):
+    if stat in MEMORY_STATS:
+        return f"{value / (1024 * 1024):+.2f} MB"
+    return f"{value:+d}"
+
 
 class VVTools_PT_VRCAnalysis(Panel):
     bl_idname = "VV_TOOLS_PT_vrc_analysis"
@@ -17,35 +22,122 @@ class VVTools_PT_VRCAnalysis(Panel):
     def draw(self, context):
         layout = self.layout
 
-        results = None
-        if "VRC_Analysis_Results" in context.scene:
-            results_str = context.scene["VRC_Analysis_Results"]
-            results = json.loads(results_str)
+        display = get_analysis_display(context.scene)
 
-
-        if results:
+        if display:
+            results = display['results']
+            if 'partial' in results:
+                layout.label(text=f"Partial results: {results['partial']['analysed']}/{results['partial']['total']} objects", icon='TIME')
             layout.label(text=f"Polygons (Tris): {results['triangles']}/69999")
             layout.label(text=f"Texture Memory (EXPERIMENTAL): {results['texture_memory'] / (1024 * 1024):.2f} MB")
+            if 'shape_key_memory' in results:
+                layout.label(text=f"Blendshape Memory: {results['shape_key_memory'] / (1024 * 1024):.2f} MB")
+            if 'vertex_buffer_memory' in results:
+                layout.label(text=f"Vertices: {results['vertices']} ({results['vertex_buffer_memory'] / (1024 * 1024):.2f} MB)")
             layout.label(text=f"Skinned Meshes: {results['skinned_meshes']}")
             layout.label(text=f"Meshes: {results['meshes']}")
             layout.label(text=f"Material Slots: {results['material_slots']}")
-            layout.label(text=f"Bones: {results['bones']}")
+            if 'bones_total' in results:
+                layout.label(text=f"Bones: {results['bones']} (of {results['bones_total']})")
+            else:
+                layout.label(text=f"Bones: {results['bones']}")
 
             layout.separator()
-            layout.label(text=f"Performance Rank: {performance_rank(results)}")
-            warnings = performance_warning(results)
-            for warning in warnings:
+            profiles = get_active_rank_profiles(context.scene)
+            selected_profiles = get_selected_profiles(context.scene, profiles)
+            for profile_id in selected_profiles:
+                ranking = get_profile_ranking(display, profiles, profile_id)
+                layout.label(text=f"Performance Rank ({profiles[profile_id]['label']}): {ranking['rank']}")
+
+            # Warnings only for the first profile, they'd mostly just repeat otherwise
+            for lines in get_profile_ranking(display, profiles, selected_profiles[0])['warnings']:
                 box = layout.box()
-                lines = re.split(r'(?<=[.!,] )', warning)  # Split the text at both '. ' and ', '. This is a bit of a hack - maybe I should shorten warnings...
                 for line in lines:
-                    if line:
-                        box.label(text=line)
+                    box.label(text=line)
+
+            if results.get('avatars'):
+                box = layout.box()
+                box.label(text="Avatars")
+                avatar_ranks = get_avatar_ranks(display, profiles, selected_profiles[0])
+                for avatar_name, statistics in results['avatars'].items():
+                    row = box.row()
+                    row.label(text=avatar_name, icon='OUTLINER_OB_ARMATURE')
+                    row.label(text=f"{statistics['triangles']} tris, {avatar_ranks[avatar_name]}")
+
+            if 'objects' in results:
+                box = layout.box()
+                row = box.row(align=True)
+                row.label(text="Top Objects")
+                row.prop(context.scene, "vv_tools_vrc_top_sort", text="")
+                row.prop(context.scene, "vv_tools_vrc_top_count")
+                sort_key = context.scene.vv_tools_vrc_top_sort
+                for obj in get_top_objects(display, sort_key, context.scene.vv_tools_vrc_top_count):
+                    row = box.row()
+                    row.label(text=obj['name'], icon='OUTLINER_OB_ARMATURE' if obj['type'] == 'ARMATURE' else 'OUTLINER_OB_MESH')
+                    if sort_key in MEMORY_STATS:
+                        row.label(text=f"{obj[sort_key] / (1024 * 1024):.2f} MB")
+                    else:
+                        row.label(text=str(obj[sort_key]))
+
+            diff = get_baseline_diff(display, context.scene)
+            if diff is not None:
+                box = layout.box()
+                row = box.row()
+                row.label(text=f"Since Baseline #{diff['baseline']['id']} ({diff['baseline']['time']})")
+                row.operator("vv_tools.vrc_clear_baseline", text="", icon='X')
+                changed_totals = [(stat, value) for stat, value in diff['totals'].items() if value]
+                if not changed_totals and not diff['objects']:
+                    box.label(text="No changes")
+                for stat, value in changed_totals:
+                    box.label(text=f"{stat.replace('_', ' ').title()}: {format_delta(stat, value)}")
+                for obj in diff['objects'][:context.scene.vv_tools_vrc_top_count]:
+                    row = box.row()
+                    row.label(text=obj['name'], icon={'added': 'ADD', 'removed': 'REMOVE'}.get(obj['status'], 'DOT'))
+                    row.label(text=f"{obj['triangles']:+d} tris, {format_delta('texture_memory', obj['texture_memory'])}")
 
         else:
             layout.label(text="No analysis data available")
-            layout.label(text="Will run slow on first use!")
 
-        layout.operator("vv_tools.vrc_analyse")
+        row = layout.row(align=True)
+        row.prop(context.scene, "vv_tools_vrc_scope", text="")
+        if context.scene.vv_tools_vrc_scope == 'COLLECTION':
+            row.prop(context.scene, "vv_tools_vrc_scope_collection", text="")
+        elif context.scene.vv_tools_vrc_scope == 'ARMATURE':
+            row.prop(context.scene, "vv_tools_vrc_scope_armature", text="")
+        row = layout.row(align=True)
+        row.operator("vv_tools.vrc_analyse")
+        row.operator("vv_tools.vrc_analyse_modal", text="", icon='TIME')
+        row.operator("vv_tools.vrc_export_report", text="", icon='EXPORT')
+        row = layout.row(align=True)
+        row.prop(context.scene, "vv_tools_vrc_live")
+        sub = row.row(align=True)
+        sub.active = context.scene.vv_tools_vrc_live
+        sub.prop(context.scene, "vv_tools_vrc_live_interval", text="")
+
+        history = get_analysis_history(context.scene)['history']
+        box = layout.box()
+        row = box.row(align=True)
+        row.label(text="History")
+        row.prop(context.scene, "vv_tools_vrc_history_size", text="Keep")
+        row.operator("vv_tools.vrc_clear_history", text="", icon='TRASH')
+        if not history:
+            box.label(text="No snapshots yet")
+        for snapshot in reversed(history):
+            row = box.row()
+            row.label(text=f"#{snapshot['id']} {snapshot['time']}: {snapshot['totals']['triangles']} tris")
+            row.operator("vv_tools.vrc_pin_baseline", text="", icon='PINNED').snapshot_id = snapshot['id']
+
+        box = layout.box()
+        box.label(text="Rank Profiles")
+        box.row().prop(context.scene, "vv_tools_vrc_profiles")
+        box.prop(context.scene, "vv_tools_vrc_custom_profiles", text="")
+
+        box = layout.box()
+        box.label(text="Texture Import Settings")
+        row = box.row(align=True)
+        row.prop(context.scene, "vv_tools_vrc_texture_max_size", text="")
+        row.prop(context.scene, "vv_tools_vrc_texture_mipmaps", toggle=True)
+        box.prop(context.scene, "vv_tools_vrc_texture_compression", text="")
 
 classes = [
     VVTools_PT_VRCAnalysis,
@@ -0,0 +1,203 @@
+# vrcbatch.py
+
+# Headless batch VRC audit
+## Runs the VRC analysis over every .blend file in a directory tree, without opening anything in the UI.
+## Files are fanned out over a pool of background Blender processes (one per core by default), results are streamed into a single JSON lines or CSV report.
+### Usage, either through Blender:
+###     blender -b -P vv_tools/vrcbatch.py -- path/to/avatars --output report.jsonl
+### or plain Python, pointing at a Blender binary:
+###     python vv_tools/vrcbatch.py path/to/avatars --blender /path/to/blender --output report.csv
+### Workers that crash or hang are restarted (--retries), and the report is always written in sorted file order so runs can be diffed.
+
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+RESULT_PREFIX = "VVTOOLS_VRC_RESULT:"
+
+CSV_FIELDS = [
+    "file",
+    "status",
+    "rank",
+    "ranks",
+    "triangles",
+    "texture_memory",
+    "skinned_meshes",
+    "meshes",
+    "material_slots",
+    "bones",
+    "warnings",
+    "attempts",
+    "error",
+]
+
+
+def _script_args():
+    # Blender passes everything after '--' through to the script
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+    if bpy is not None:
+        return []
+    return sys.argv[1:]
+
+
+def _import_analysis():
+    # The addon package is whatever folder this file lives in (usually vv_tools)
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, os.path.dirname(package_dir))
+    import importlib
+    return importlib.import_module(os.path.basename(package_dir) + ".operators.vrcanalysisops")
+
+
+# Worker - runs inside a background Blender with the .blend already open, prints a single result line for the coordinator.
+
+def run_worker(armature=None):
+    # Python errors are reported rather than retried, they'd just happen again. Retries are for actual crashes.
+    try:
+        vrcanalysisops = _import_analysis()
+        view_layer = bpy.context.view_layer
+        objects = [obj for obj in view_layer.objects if obj.type in vrcanalysisops.ANALYSED_TYPES]
+        # Every avatar gets its own summary from the same run, --armature narrows the whole report down to one of them
+        index = vrcanalysisops.build_armature_index(objects)
+        if armature is not None:
+            if armature not in index:
+                raise KeyError(f"No avatar armature named '{armature}'")
+            objects, index = index[armature], {armature: index[armature]}
+        avatars = {avatar_name: [obj.name for obj in avatar_objects] for avatar_name, avatar_objects in index.items()}
+        statistics = vrcanalysisops.analyze_objects(objects, texture_settings=vrcanalysisops.DEFAULT_TEXTURE_SETTINGS, avatars=avatars)
+        profiles = vrcanalysisops.get_rank_profiles()
+        result = {
+            "status": "ok",
+            "statistics": statistics,
+            "rank": vrcanalysisops.performance_rank(statistics, profiles=profiles),
+            "ranks": {profile_id: vrcanalysisops.performance_rank(statistics, profile_id, profiles) for profile_id in profiles},
+            "warnings": vrcanalysisops.performance_warning(statistics, profiles=profiles),
+        }
+    except Exception as e:
+        result = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+    print(RESULT_PREFIX + json.dumps(result), flush=True)
+
+
+# Coordinator
+
+def find_blend_files(directory):
+    blend_files = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(".blend"):
+                blend_files.append(os.path.join(root, name))
+    return blend_files
+
+
+def audit_file(blender, filepath, retries=1, timeout=600, armature=None):
+    command = [blender, "-b", "--factory-startup", filepath, "-P", os.path.abspath(__file__), "--", "--worker"]
+    if armature is not None:
+        command += ["--armature", armature]
+    error = None
+    for attempt in range(1, retries + 2):
+        try:
+            process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors="replace", timeout=timeout)
+        except subprocess.TimeoutExpired:
+            error = f"Timed out after {timeout}s"
+            continue
+        except OSError as e:
+            # Can't even start Blender, retrying won't help
+            return {"status": "error", "error": str(e), "attempts": attempt}
+
+        for line in process.stdout.splitlines():
+            if line.startswith(RESULT_PREFIX):
+                result = json.loads(line[len(RESULT_PREFIX):])
+                result["attempts"] = attempt
+                return result
+
+        output = process.stdout.strip().splitlines()
+        error = f"Worker exited with code {process.returncode}: {output[-1] if output else 'no output'}"
+
+    return {"status": "error", "error": error, "attempts": retries + 1}
+
+
+def _csv_row(filepath, result):
+    statistics = result.get("statistics", {})
+    row = {
+        "file": filepath,
+        "status": result.get("status"),
+        "rank": result.get("rank", ""),
+        "ranks": ", ".join(f"{profile_id}: {rank}" for profile_id, rank in result.get("ranks", {}).items()),
+        "warnings": len(result.get("warnings", [])),
+        "attempts": result.get("attempts", ""),
+        "error": result.get("error", ""),
+    }
+    for field in CSV_FIELDS:
+        if field in statistics:
+            row[field] = statistics[field]
+    return row
+
+
+def run_batch(directory, output, blender, jobs=None, retries=1, timeout=600, report_format=None, armature=None):
+    blend_files = find_blend_files(directory)
+    if report_format is None:
+        report_format = "csv" if output.lower().endswith(".csv") else "jsonl"
+    jobs = jobs or os.cpu_count() or 1
+
+    with open(output, "w", newline="") as f, ThreadPoolExecutor(max_workers=jobs) as pool:
+        writer = None
+        if report_format == "csv":
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+
+        futures = [pool.submit(audit_file, blender, filepath, retries, timeout, armature) for filepath in blend_files]
+
+        # Collect in submission order - results are still streamed out as soon as everything before them is done
+        for index, (filepath, future) in enumerate(zip(blend_files, futures), 1):
+            result = future.result()
+            relative_path = os.path.relpath(filepath, directory)
+            if writer is not None:
+                writer.writerow(_csv_row(relative_path, result))
+            else:
+                f.write(json.dumps({"file": relative_path, **result}) + "\n")
+            f.flush()
+            print(f"[{index}/{len(blend_files)}] {relative_path}: {result.get('rank') or result.get('error')}")
+
+    return len(blend_files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch VRC analysis of .blend files")
+    parser.add_argument("directory", nargs="?", help="Directory to search for .blend files")
+    parser.add_argument("-o", "--output", default="vrc_audit.jsonl", help="Report file, .jsonl or .csv")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Report format, guessed from the output extension if not set")
+    parser.add_argument("--blender", help="Blender binary used for workers (defaults to the running Blender)")
+    parser.add_argument("-j", "--jobs", type=int, help="Number of worker processes, defaults to the number of cores")
+    parser.add_argument("--retries", type=int, default=1, help="Times to restart a crashed / hung worker")
+    parser.add_argument("--timeout", type=int, default=600, help="Seconds before a worker is considered hung")
+    parser.add_argument("--armature", help="Only audit the avatar with this armature (top level armature object name)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(_script_args())
+
+    if args.worker:
+        run_worker(args.armature)
+        return
+
+    if not args.directory:
+        parser.error("a directory is required")
+
+    blender = args.blender or (bpy.app.binary_path if bpy is not None else None)
+    if not blender:
+        parser.error("--blender is required when not running inside Blender")
+
+    count = run_batch(args.directory, args.output, blender, args.jobs, args.retries, args.timeout, args.format, args.armature)
+    print(f"Analysed {count} files, report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
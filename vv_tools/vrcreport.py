@@ -0,0 +1,217 @@
+# vrcreport.py
+
+# VRC analysis report files
+## Writes analysis reports (built by vrcanalysisops.build_analysis_report) out as JSON, CSV or a compact binary format, and reads them back.
+## Meant for upload pipelines that gate on the analysis - the report has totals, rank and warnings per profile, the per-object breakdown, per-avatar summaries and timing.
+### Pure Python, no bpy in here, so pipelines can read reports without Blender.
+### Binary layout (little endian): b"VVRC", uint16 version, then a string table (uint32 count, each string uint16 length + UTF-8) followed by sections that only reference strings by index:
+###     header   - file, generated (string indices)
+###     totals   - uint16 count, each (uint32 name, int64 value)
+###     profiles - uint16 count, each (uint32 profile, uint32 rank, uint16 warning count, uint32 warning...)
+###     objects  - uint16 field count, uint32 field names..., uint32 object count, each (uint32 name, uint32 type, int64 value per field)
+###     avatars  - uint16 count, each (uint32 name, then int64 per total name, same order as totals), uint16 ranked profile count, uint32 profile..., uint32 rank per avatar per profile
+###     timing   - float64 seconds, uint32 objects, uint32 evaluated, uint32 cached
+
+import csv
+import json
+import os
+import struct
+
+REPORT_VERSION = 1
+BINARY_MAGIC = b"VVRC"
+
+REPORT_FORMATS = ("json", "csv", "binary")
+_FORMATS_BY_EXTENSION = {".json": "json", ".csv": "csv", ".vvrc": "binary"}
+
+# Columns of the per-object breakdown that make it into CSV and binary reports. JSON reports keep everything.
+OBJECT_FIELDS = (
+    "triangles",
+    "vertices",
+    "vertex_buffer_memory",
+    "uv_maps",
+    "color_attributes",
+    "texture_memory",
+    "shape_key_memory",
+    "material_slots",
+    "bones",
+)
+
+
+def guess_report_format(filepath):
+    return _FORMATS_BY_EXTENSION.get(os.path.splitext(filepath)[1].lower(), "json")
+
+
+def write_report(report, filepath, report_format=None):
+    report_format = report_format or guess_report_format(filepath)
+    if report_format == "json":
+        with open(filepath, "w") as f:
+            json.dump(report, f, indent=1)
+    elif report_format == "csv":
+        _write_csv(report, filepath)
+    elif report_format == "binary":
+        with open(filepath, "wb") as f:
+            f.write(encode_binary_report(report))
+    else:
+        raise ValueError(f"Unknown report format '{report_format}'")
+    return report_format
+
+
+def read_report(filepath, report_format=None):
+    # CSV reports are flattened for spreadsheets and can't be read back
+    report_format = report_format or guess_report_format(filepath)
+    if report_format == "binary":
+        with open(filepath, "rb") as f:
+            return decode_binary_report(f.read())
+    if report_format == "json":
+        with open(filepath) as f:
+            return json.load(f)
+    raise ValueError(f"Can't read '{report_format}' reports")
+
+
+# CSV - one row per object, plus a row for the totals and one per avatar carrying the ranks
+
+def _write_csv(report, filepath):
+    profile_ids = list(report["ranks"])
+    fieldnames = ["kind", "name", "type", *OBJECT_FIELDS, *(f"rank_{profile_id}" for profile_id in profile_ids), "warnings"]
+
+    with open(filepath, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+
+        total_row = {"kind": "total", "name": report.get("file", ""), **report["statistics"]}
+        total_row.update((f"rank_{profile_id}", rank) for profile_id, rank in report["ranks"].items())
+        total_row["warnings"] = sum(len(warnings) for warnings in report["warnings"].values())
+        writer.writerow(total_row)
+
+        for avatar_name, avatar in report.get("avatars", {}).items():
+            avatar_row = {"kind": "avatar", "name": avatar_name, "type": "ARMATURE", **avatar["statistics"]}
+            avatar_row.update((f"rank_{profile_id}", rank) for profile_id, rank in avatar["ranks"].items())
+            writer.writerow(avatar_row)
+
+        for obj in report["objects"]:
+            writer.writerow({"kind": "object", **obj})
+
+
+# Binary
+
+class _StringTable:
+    def __init__(self):
+        self.strings = []
+        self.indices = {}
+
+    def __call__(self, string):
+        string = str(string)
+        index = self.indices.get(string)
+        if index is None:
+            index = self.indices[string] = len(self.strings)
+            self.strings.append(string)
+        return index
+
+
+def encode_binary_report(report):
+    strings = _StringTable()
+    body = bytearray()
+
+    body += struct.pack("<II", strings(report.get("file", "")), strings(report.get("generated", "")))
+
+    totals = [(name, value) for name, value in report["statistics"].items() if isinstance(value, (int, float))]
+    body += struct.pack("<H", len(totals))
+    for name, value in totals:
+        body += struct.pack("<Iq", strings(name), int(value))
+
+    body += struct.pack("<H", len(report["ranks"]))
+    for profile_id, rank in report["ranks"].items():
+        warnings = report["warnings"].get(profile_id, [])
+        body += struct.pack("<IIH", strings(profile_id), strings(rank), len(warnings))
+        body += struct.pack(f"<{len(warnings)}I", *map(strings, warnings))
+
+    objects = report["objects"]
+    body += struct.pack("<H", len(OBJECT_FIELDS))
+    body += struct.pack(f"<{len(OBJECT_FIELDS)}I", *map(strings, OBJECT_FIELDS))
+    body += struct.pack("<I", len(objects))
+    object_struct = struct.Struct(f"<II{len(OBJECT_FIELDS)}q")
+    for obj in objects:
+        body += object_struct.pack(strings(obj["name"]), strings(obj["type"]), *(int(obj.get(field, 0)) for field in OBJECT_FIELDS))
+
+    avatars = report.get("avatars", {})
+    total_names = [name for name, _ in totals]
+    profile_ids = list(report["ranks"])
+    body += struct.pack("<H", len(avatars))
+    for avatar_name, avatar in avatars.items():
+        body += struct.pack("<I", strings(avatar_name))
+        body += struct.pack(f"<{len(total_names)}q", *(int(avatar["statistics"].get(name, 0)) for name in total_names))
+    body += struct.pack("<H", len(profile_ids) if avatars else 0)
+    if avatars:
+        body += struct.pack(f"<{len(profile_ids)}I", *map(strings, profile_ids))
+        for avatar in avatars.values():
+            body += struct.pack(f"<{len(profile_ids)}I", *(strings(avatar["ranks"].get(profile_id, "")) for profile_id in profile_ids))
+
+    timing = report.get("timing", {})
+    body += struct.pack("<dIII", timing.get("seconds", 0.0), timing.get("objects", 0), timing.get("evaluated", 0), timing.get("cached", 0))
+
+    header = bytearray(BINARY_MAGIC + struct.pack("<HI", REPORT_VERSION, len(strings.strings)))
+    for string in strings.strings:
+        encoded = string.encode("utf-8")
+        header += struct.pack("<H", len(encoded)) + encoded
+    return bytes(header + body)
+
+
+def decode_binary_report(data):
+    if data[:4] != BINARY_MAGIC:
+        raise ValueError("Not a VV Tools VRC report")
+    version, string_count = struct.unpack_from("<HI", data, 4)
+    if version != REPORT_VERSION:
+        raise ValueError(f"Unsupported report version {version}")
+    offset = 10
+
+    def read(fmt):
+        nonlocal offset
+        values = struct.unpack_from("<" + fmt, data, offset)
+        offset += struct.calcsize("<" + fmt)
+        return values
+
+    strings = []
+    for _ in range(string_count):
+        length, = read("H")
+        strings.append(data[offset:offset + length].decode("utf-8"))
+        offset += length
+
+    file_index, generated_index = read("II")
+    report = {"version": version, "file": strings[file_index], "generated": strings[generated_index]}
+
+    total_count, = read("H")
+    totals = [read("Iq") for _ in range(total_count)]
+    report["statistics"] = {strings[name]: value for name, value in totals}
+
+    report["ranks"] = {}
+    report["warnings"] = {}
+    profile_count, = read("H")
+    for _ in range(profile_count):
+        profile_index, rank_index, warning_count = read("IIH")
+        profile_id = strings[profile_index]
+        report["ranks"][profile_id] = strings[rank_index]
+        report["warnings"][profile_id] = [strings[index] for index in read(f"{warning_count}I")]
+
+    field_count, = read("H")
+    fields = [strings[index] for index in read(f"{field_count}I")]
+    object_count, = read("I")
+    report["objects"] = []
+    for _ in range(object_count):
+        name_index, type_index, *values = read(f"II{field_count}q")
+        report["objects"].append({"name": strings[name_index], "type": strings[type_index], **dict(zip(fields, values))})
+
+    avatar_count, = read("H")
+    avatars = []
+    for _ in range(avatar_count):
+        name_index, = read("I")
+        avatars.append((strings[name_index], dict(zip(report["statistics"], read(f"{total_count}q")))))
+    ranked_count, = read("H")
+    profile_ids = [strings[index] for index in read(f"{ranked_count}I")]
+    report["avatars"] = {}
+    for avatar_name, statistics in avatars:
+        ranks = [strings[index] for index in read(f"{ranked_count}I")]
+        report["avatars"][avatar_name] = {"statistics": statistics, "ranks": dict(zip(profile_ids, ranks))}
+
+    seconds, objects, evaluated, cached = read("dIII")
+    report["timing"] = {"seconds": seconds, "objects": objects, "evaluated": evaluated, "cached": cached}
+    return report